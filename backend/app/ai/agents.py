@@ -5,6 +5,11 @@ Sophisticated strategic agents for Tigers and Goats with proper capture mechanic
 
 import numpy as np
 import random
+import copy
+import functools
+import json
+import logging
+import time
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 import sys
@@ -14,10 +19,20 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "backend"))
 
 try:
-    from ..core.baghchal_env import BaghchalEnv, Player, GamePhase, PieceType
+    from ..core.baghchal_env import (BaghchalEnv, Player, GamePhase, PieceType, FULL_BOARD_BB, SQUARE_BITS,
+                                     JUMP_SRC, JUMP_DST, ActionArray, ACTION_MOVE)
 except ImportError:
     print("Warning: Could not import BaghchalEnv from backend")
 
+from ._ai_kernels import bitboard_safe_squares, tiger_mobility
+
+logger = logging.getLogger(__name__)
+
+# PieceType values bound once, so hot loops compare plain ints instead of resolving the enum each time
+_EMPTY = PieceType.EMPTY.value
+_TIGER = PieceType.TIGER.value
+_GOAT = PieceType.GOAT.value
+
 class TigerStrategy(Enum):
     AGGRESSIVE_HUNT = "aggressive_hunt"
     OPPORTUNISTIC = "opportunistic"
@@ -32,354 +47,505 @@ class GoatStrategy(Enum):
     ADVANCED_TRAPPING = "advanced_trapping"
     WALL_BUILDER = "wall_builder"
 
-class AdvancedTigerAI:
+# Search configuration
+WIN_SCORE = 10000
+CAPTURE_WEIGHT = 100
+MOBILITY_WEIGHT = 2
+SEARCH_DEPTHS = {"easy": 0, "medium": 2, "hard": 3, "expert": 4}
+TT_MAX_ENTRIES = 1 << 18
+LEGAL_MOVES_CACHE_SIZE = 1 << 20
+MOBILITY_CACHE_MAX_ENTRIES = 1 << 18
+# Half-width of the aspiration window around the previous iteration's score (half a capture)
+ASPIRATION_WINDOW = 50
+# With a time budget, a deeper iteration only starts while less than this share of the budget is spent,
+# since each extra ply costs more than everything searched before it
+TIME_BUDGET_NEXT_DEPTH_FRACTION = 0.5
+
+# Row/column index grids for whole-board distance maps
+_ROWS, _COLS = np.indices((5, 5))
+
+# Static goat square bonus: edges 10 (corners 15), center ring 8, center point 20
+SQUARE_BONUS = np.zeros((5, 5), dtype=np.int32)
+SQUARE_BONUS[[0, 4], :] = 10
+SQUARE_BONUS[1:4, [0, 4]] = 10
+SQUARE_BONUS[[0, 0, 4, 4], [0, 4, 0, 4]] = 15
+# CENTER_RING is the center-control part on its own
+CENTER_RING = np.zeros((5, 5), dtype=np.int32)
+CENTER_RING[1:4, 1:4] = 8
+CENTER_RING[2, 2] = 20
+SQUARE_BONUS += CENTER_RING
+
+# Transposition table bound flags
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Zobrist keys: one per (piece value, square), plus side-to-move and goat counters
+_zobrist_rng = random.Random(0xBA6C)
+ZOBRIST_PIECES = [[_zobrist_rng.getrandbits(64) for _ in range(25)] for _ in range(3)]
+ZOBRIST_TIGER_TO_MOVE = _zobrist_rng.getrandbits(64)
+ZOBRIST_GOATS_PLACED = [_zobrist_rng.getrandbits(64) for _ in range(21)]
+ZOBRIST_GOATS_CAPTURED = [_zobrist_rng.getrandbits(64) for _ in range(21)]
+# ZOBRIST_PIECES as a [piece value, square] array with the empty row zeroed, for hashing a whole board at once
+ZOBRIST_BOARD = np.array(ZOBRIST_PIECES, dtype=np.uint64)
+ZOBRIST_BOARD[_EMPTY] = 0
+_SQUARES = np.arange(25)
+
+def _piece_positions(env, piece: PieceType) -> np.ndarray:
+    """Return the (N, 2) row/col array of a piece type, using the env-maintained piece lists when present."""
+    if not hasattr(env, 'tiger_positions'):
+        return np.argwhere(np.asarray(env.board) == piece.value)
+    if piece == PieceType.TIGER:
+        return env.tiger_positions[:env.tiger_count]
+    return env.goat_positions[:env.goat_count]
+
+def _board_bitboards(board: np.ndarray, env=None) -> Tuple[int, int, int]:
+    """(tiger_bb, goat_bb, empty_bb) for a board, reusing the env-maintained bitboards when given."""
+    if env is not None and hasattr(env, 'tiger_bb'):
+        return env.tiger_bb, env.goat_bb, env.empty_bb
+    flat = np.asarray(board).ravel()
+    tiger_bb = int(SQUARE_BITS[flat == _TIGER].sum())
+    goat_bb = int(SQUARE_BITS[flat == _GOAT].sum())
+    return tiger_bb, goat_bb, FULL_BOARD_BB ^ (tiger_bb | goat_bb)
+
+class SearchingAgent:
+    """Base class adding iterative-deepening alpha-beta (negamax) search to the heuristic agents."""
+    
+    player = None
+    # Strategy enum of the concrete agent, used to read saved configs back
+    strategy_type = None
+    
+    def __init__(self, difficulty: str = "expert", search_depth: Optional[int] = None, seed=None,
+                 time_budget: Optional[float] = None):
+        self.difficulty = difficulty
+        self.search_depth = SEARCH_DEPTHS.get(difficulty, 0) if search_depth is None else search_depth
+        # Seconds per move; when set, iterative deepening stops early instead of always reaching search_depth
+        self.time_budget = time_budget
+        self.depth_reached = 0
+        # Per-agent generator: reproducible self-play without touching the global random state
+        self.rng = np.random.default_rng(seed)
+        self.transposition_table = {}
+        # Tiger mobility by board-only Zobrist key, shared by the search leaves and the greedy trapping pass
+        self.mobility_cache = {}
+        self.nodes_searched = 0
+    
+    def to_config(self) -> Dict:
+        """The agent's saved form: its strategy and difficulty."""
+        return {"strategy": self.strategy.value, "difficulty": self.difficulty}
+    
+    def save_config(self, path):
+        """Write the agent config as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_config(), f)
+    
+    @classmethod
+    def from_config(cls, path):
+        """Build an agent from a JSON config written by save_config."""
+        with open(path) as f:
+            config = json.load(f)
+        return cls(cls.strategy_type(config["strategy"]), config.get("difficulty", "expert"))
+    
+    def _search_best_action(self, env, valid_actions: List[Tuple]) -> Optional[Tuple]:
+        """
+        Run iterative deepening from depth 1 to search_depth (or until the time budget runs out) and
+        return the best root action. Each iteration's best moves, kept in the transposition table, are
+        searched first by the next one.
+        """
+        start = time.perf_counter()
+        search_env = self._clone_env(env)
+        key = self._compute_zobrist(search_env)
+        color = 1 if self.player == Player.TIGER else -1
+        
+        if len(self.transposition_table) > TT_MAX_ENTRIES:
+            self.transposition_table.clear()
+        self.nodes_searched = 0
+        self.depth_reached = 0
+        
+        # Legal moves are memoized by Zobrist key for the lifetime of this search only. The memo lives in this
+        # call, not on the agent, so concurrent searches with a shared agent never see each other's positions.
+        @functools.lru_cache(maxsize=LEGAL_MOVES_CACHE_SIZE)
+        def legal_moves(key: int, phase: GamePhase, goats_placed: int) -> Tuple[Tuple, ...]:
+            return tuple(search_env.get_valid_actions(search_env.current_player))
+        
+        best_action = None
+        value = None
+        for depth in range(1, self.search_depth + 1):
+            if (self.time_budget is not None and depth > 1 and
+                    time.perf_counter() - start > self.time_budget * TIME_BUDGET_NEXT_DEPTH_FRACTION):
+                break
+            value, action = self._aspiration_search(search_env, key, depth, value, color, legal_moves)
+            self.depth_reached = depth
+            if action is not None:
+                best_action = action
+            # A forced win or loss was found; deeper iterations cannot change the outcome
+            if abs(value) >= WIN_SCORE - 100:
+                break
+        
+        return best_action if best_action is not None else valid_actions[0]
+    
+    def _aspiration_search(self, env, key: int, depth: int, guess: Optional[int],
+                           color: int, legal_moves) -> Tuple[int, Optional[Tuple]]:
+        """Search the root in a narrow window around the previous score, re-searching fully on failure."""
+        full_alpha, full_beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        if guess is None:
+            return self._negamax(env, key, depth, full_alpha, full_beta, color, 0, legal_moves)
+        
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        value, action = self._negamax(env, key, depth, alpha, beta, color, 0, legal_moves)
+        if value <= alpha or value >= beta:
+            # Fail low/high: the true score is outside the window, so the bound is not exact
+            value, action = self._negamax(env, key, depth, full_alpha, full_beta, color, 0, legal_moves)
+        return value, action
+    
+    def _negamax(self, env, key: int, depth: int, alpha: int, beta: int, color: int, ply: int,
+                 legal_moves) -> Tuple[int, Optional[Tuple]]:
+        """Negamax with alpha-beta pruning; returns (value for side to move, best action).
+        
+        legal_moves(key, phase, goats_placed) gives the side to move's moves in env, memoized for this search.
+        """
+        self.nodes_searched += 1
+        
+        # Terminal positions (blocked tigers on their own turn are caught by the empty move list)
+        if env.goats_captured >= env.goats_to_capture_for_tiger_win:
+            return color * (WIN_SCORE - ply), None
+        player = Player.TIGER if color == 1 else Player.GOAT
+        if player == Player.GOAT and env.phase == GamePhase.MOVEMENT and env._are_tigers_blocked():
+            return WIN_SCORE - ply, None
+        
+        if depth == 0:
+            return color * self._evaluate(env, self._board_key_of(env, key)), None
+        
+        alpha_orig = alpha
+        tt_move = None
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            tt_depth, tt_flag, tt_value, tt_move = entry
+            if tt_depth >= depth and ply > 0:
+                if tt_flag == TT_EXACT:
+                    return tt_value, tt_move
+                if tt_flag == TT_LOWER:
+                    alpha = max(alpha, tt_value)
+                elif tt_flag == TT_UPPER:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    return tt_value, tt_move
+        
+        # Terminal positions returned above, so only live positions reach the move cache
+        actions = legal_moves(key, env.phase, env.goats_placed)
+        if not actions:
+            # Side to move is stuck: blocked tigers lose, stuck goats are scored statically
+            if player == Player.TIGER:
+                return -(WIN_SCORE - ply), None
+            return color * self._evaluate(env, self._board_key_of(env, key)), None
+        
+        best_value = -WIN_SCORE - 1
+        best_action = None
+        for action in self._order_actions(env, actions, tt_move, player):
+            undo = env.push(action)
+            child_key = key ^ self._zobrist_delta(env, undo)
+            child_value, _ = self._negamax(env, child_key, depth - 1, -beta, -alpha, -color, ply + 1, legal_moves)
+            env.pop(undo)
+            value = -child_value
+            
+            if value > best_value:
+                best_value = value
+                best_action = action
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+        
+        if best_value <= alpha_orig:
+            flag = TT_UPPER
+        elif best_value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.transposition_table[key] = (depth, flag, best_value, best_action)
+        
+        return best_value, best_action
+    
+    def _order_actions(self, env, actions: List[Tuple], tt_move: Optional[Tuple],
+                       player: Player) -> List[Tuple]:
+        """Order moves: transposition-table move first, then captures, then heuristic score."""
+        # The agent's own heuristic only applies to its own moves; opponent replies keep generation order
+        heuristic_scores = self._action_order_scores(env, actions) if player == self.player else None
+        scored = []
+        for i, action in enumerate(actions):
+            if action == tt_move:
+                score = 1 << 20
+            else:
+                score = heuristic_scores[i] if heuristic_scores is not None else 0
+                if action[0] == 'move' and (abs(action[3] - action[1]) == 2 or abs(action[4] - action[2]) == 2):
+                    score += 1 << 16
+            scored.append((score, action))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [action for _, action in scored]
+    
+    def _action_order_scores(self, env, actions: List[Tuple]) -> List[int]:
+        """Heuristic scores used to order non-capture moves; overridden by each agent."""
+        return [0] * len(actions)
+    
+    def _evaluate(self, env, board_key: Optional[int] = None) -> int:
+        """Static evaluation from the tiger's point of view."""
+        if board_key is None:
+            mobility = self._calculate_tiger_mobility(env.board)
+        else:
+            mobility = self._cached_tiger_mobility(board_key, env.board)
+        return CAPTURE_WEIGHT * env.goats_captured + MOBILITY_WEIGHT * mobility
+    
+    def _cached_tiger_mobility(self, board_key: int, board: np.ndarray) -> int:
+        """_calculate_tiger_mobility(board) memoized by the board's Zobrist key."""
+        mobility = self.mobility_cache.get(board_key)
+        if mobility is None:
+            if len(self.mobility_cache) > MOBILITY_CACHE_MAX_ENTRIES:
+                self.mobility_cache.clear()
+            mobility = self.mobility_cache[board_key] = self._calculate_tiger_mobility(board)
+        return mobility
+    
+    def _calculate_tiger_mobility(self, board: np.ndarray) -> int:
+        """Calculate total number of moves available to all tigers (captures count double)."""
+        return int(tiger_mobility(np.ascontiguousarray(board, dtype=np.int8).ravel()))
+    
+    def _clone_env(self, env):
+        """Create a scratch copy of the environment that the search can mutate freely."""
+        search_env = copy.copy(env)
+        search_env.board = np.array(env.board, copy=True)
+        search_env.current_player = self.player
+        return search_env
+    
+    def _board_key(self, board: np.ndarray) -> int:
+        """Zobrist hash of the pieces alone, computed from scratch with one fancy-indexed XOR reduction."""
+        return int(np.bitwise_xor.reduce(ZOBRIST_BOARD[np.asarray(board).ravel(), _SQUARES]))
+    
+    def _board_key_of(self, env, key: int) -> int:
+        """Strip side to move and goat counters from a search key, leaving the pieces-only board key."""
+        key ^= ZOBRIST_GOATS_PLACED[env.goats_placed] ^ ZOBRIST_GOATS_CAPTURED[env.goats_captured]
+        if env.current_player == Player.TIGER:
+            key ^= ZOBRIST_TIGER_TO_MOVE
+        return key
+    
+    def _goat_action_key(self, board_key: int, action: Tuple) -> int:
+        """Board key after a goat placement or step (goat actions never capture)."""
+        goat_keys = ZOBRIST_PIECES[_GOAT]
+        if action[0] == 'place':
+            return board_key ^ goat_keys[action[1] * 5 + action[2]]
+        return board_key ^ goat_keys[action[1] * 5 + action[2]] ^ goat_keys[action[3] * 5 + action[4]]
+    
+    def _compute_zobrist(self, env) -> int:
+        """Compute the Zobrist hash of a position from scratch."""
+        key = self._board_key(env.board)
+        if self.player == Player.TIGER:
+            key ^= ZOBRIST_TIGER_TO_MOVE
+        key ^= ZOBRIST_GOATS_PLACED[env.goats_placed]
+        key ^= ZOBRIST_GOATS_CAPTURED[env.goats_captured]
+        return key
+    
+    def _zobrist_delta(self, env, undo) -> int:
+        """Zobrist key change caused by an action just applied with env.push."""
+        action = undo.action
+        delta = ZOBRIST_TIGER_TO_MOVE
+        
+        if action[0] == 'place':
+            delta ^= ZOBRIST_PIECES[_GOAT][action[1] * 5 + action[2]]
+            delta ^= ZOBRIST_GOATS_PLACED[undo.prev_goats_placed] ^ ZOBRIST_GOATS_PLACED[env.goats_placed]
+        else:
+            _, fr, fc, tr, tc = action
+            piece = int(env.board[tr, tc])
+            delta ^= ZOBRIST_PIECES[piece][fr * 5 + fc] ^ ZOBRIST_PIECES[piece][tr * 5 + tc]
+            if undo.captured_pos is not None:
+                mr, mc = undo.captured_pos
+                delta ^= ZOBRIST_PIECES[_GOAT][mr * 5 + mc]
+                delta ^= ZOBRIST_GOATS_CAPTURED[undo.prev_goats_captured] ^ ZOBRIST_GOATS_CAPTURED[env.goats_captured]
+        
+        return delta
+
+class AdvancedTigerAI(SearchingAgent):
     """Advanced Tiger AI with sophisticated hunting strategies."""
     
-    def __init__(self, strategy: TigerStrategy = TigerStrategy.AGGRESSIVE_HUNT, difficulty: str = "expert"):
+    player = Player.TIGER
+    strategy_type = TigerStrategy
+    
+    def __init__(self, strategy: TigerStrategy = TigerStrategy.AGGRESSIVE_HUNT, difficulty: str = "expert",
+                 search_depth: Optional[int] = None, seed=None, time_budget: Optional[float] = None):
+        super().__init__(difficulty, search_depth, seed, time_budget)
         self.strategy = strategy
-        self.difficulty = difficulty
-        print(f"🐅 Advanced Tiger AI initialized: {strategy.value} ({difficulty})")
+        logger.debug("🐅 Advanced Tiger AI initialized: %s (%s)", strategy.value, difficulty)
     
     def select_action(self, env, state: Dict) -> Optional[Tuple]:
         """Select the best action using advanced strategic analysis."""
-        valid_actions = env.get_valid_actions(Player.TIGER)
-        if not valid_actions:
+        if self.search_depth > 0:
+            valid_actions = env.get_valid_actions(Player.TIGER)
+            return self._search_best_action(env, valid_actions) if valid_actions else None
+        
+        actions = env.get_valid_action_array(Player.TIGER)
+        if not len(actions.kinds):
             return None
         
         # PRIORITY 1: Always prioritize captures
-        capture_actions = self._find_capture_actions(valid_actions, state['board'])
-        if capture_actions:
-            print(f"🎯 TIGER found {len(capture_actions)} capture opportunities!")
-            return self._select_best_capture(capture_actions, state)
+        capture_coords = self._find_capture_actions(actions.coords, state['board'])
+        if len(capture_coords):
+            logger.debug("🎯 TIGER found %d capture opportunities!", len(capture_coords))
+            return self._select_best_capture(capture_coords, state)
         
         # PRIORITY 2: Strategic positioning
-        return self._select_strategic_action(valid_actions, state)
+        return self._select_strategic_action(actions, env)
     
-    def _find_capture_actions(self, valid_actions: List[Tuple], board: np.ndarray) -> List[Tuple]:
-        """Find all actions that result in capturing goats."""
-        capture_actions = []
-        
-        for action in valid_actions:
-            if len(action) == 5 and action[0] == 'move':
-                from_r, from_c, to_r, to_c = action[1], action[2], action[3], action[4]
-                
-                # Check if this is a capture move (distance > 1 indicates a jump)
-                distance = max(abs(to_r - from_r), abs(to_c - from_c))
-                if distance > 1:
-                    # Verify there's a goat to capture
-                    mid_r = (from_r + to_r) // 2
-                    mid_c = (from_c + to_c) // 2
-                    if 0 <= mid_r < 5 and 0 <= mid_c < 5 and board[mid_r, mid_c] == 2:  # Goat value
-                        capture_actions.append(action)
-        
-        return capture_actions
+    def _find_capture_actions(self, coords: np.ndarray, board: np.ndarray) -> np.ndarray:
+        """Rows of the int8[N,4] move coords that jump over a goat."""
+        dist = np.maximum(np.abs(coords[:, 2] - coords[:, 0]), np.abs(coords[:, 3] - coords[:, 1]))
+        mid_r = (coords[:, 0] + coords[:, 2]) // 2
+        mid_c = (coords[:, 1] + coords[:, 3]) // 2
+        mask = (dist > 1) & (board[mid_r, mid_c] == _GOAT)
+        return coords[mask]
     
-    def _select_best_capture(self, capture_actions: List[Tuple], state: Dict) -> Tuple:
+    def _select_best_capture(self, capture_coords: np.ndarray, state: Dict) -> Tuple:
         """Select the best capture action."""
         # For now, just return the first capture (all captures are valuable)
-        return capture_actions[0]
+        return ('move', *capture_coords[0].tolist())
     
-    def _select_strategic_action(self, valid_actions: List[Tuple], state: Dict) -> Optional[Tuple]:
+    def _select_strategic_action(self, actions: ActionArray, env) -> Optional[Tuple]:
         """Select action based on current strategy."""
-        board = state['board']
-        
-        # Find goat positions
-        goat_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 2:  # Goat value
-                    goat_positions.append((r, c))
-        
-        best_action = None
-        best_score = -1
-        
-        for action in valid_actions:
-            if len(action) >= 5 and action[0] == 'move':
-                from_r, from_c, to_r, to_c = action[1], action[2], action[3], action[4]
-                
-                # Score based on proximity to goats
-                score = 0
-                for goat_r, goat_c in goat_positions:
-                    old_distance = abs(from_r - goat_r) + abs(from_c - goat_c)
-                    new_distance = abs(to_r - goat_r) + abs(to_c - goat_c)
-                    if new_distance < old_distance:
-                        score += 10  # Getting closer to goat
-                    
-                    # Bonus for adjacent positioning (setup for capture)
-                    if new_distance == 1:
-                        score += 20
-                
-                # Bonus for center control
-                if (to_r, to_c) == (2, 2):
-                    score += 15
-                
-                if score > best_score:
-                    best_score = score
-                    best_action = action
+        moves = np.flatnonzero(actions.kinds == ACTION_MOVE)
+        if not len(moves):
+            return actions.to_tuple(int(self.rng.integers(0, len(actions.kinds))))
         
-        return best_action if best_action else random.choice(valid_actions)
+        scores = self._score_strategic_moves(actions.coords[moves], _piece_positions(env, PieceType.GOAT))
+        return actions.to_tuple(moves[np.argmax(scores)])
+    
+    def _score_strategic_moves(self, coords: np.ndarray, goat_positions: np.ndarray) -> np.ndarray:
+        """Score tiger moves, one per row of the int8[N,4] move coords, by how much they close in on the goats."""
+        goats = goat_positions[None, :, :].astype(np.int16)
+        old_distance = np.abs(goats - coords[:, None, 0:2]).sum(axis=2)
+        new_distance = np.abs(goats - coords[:, None, 2:4]).sum(axis=2)
+        
+        scores = 10 * (new_distance < old_distance).sum(axis=1)  # Getting closer to goat
+        scores += 20 * (new_distance == 1).sum(axis=1)  # Setup for capture
+        scores += 15 * ((coords[:, 2] == 2) & (coords[:, 3] == 2))  # Center control
+        return scores
+    
+    def _action_order_scores(self, env, actions: List[Tuple]) -> List[int]:
+        """Order tiger moves in the search by the strategic proximity score."""
+        coords = np.array([action[1:5] for action in actions], dtype=np.int8).reshape(-1, 4)
+        return self._score_strategic_moves(coords, env.goat_positions[:env.goat_count]).tolist()
 
-class AdvancedGoatAI:
+class AdvancedGoatAI(SearchingAgent):
     """Advanced Goat AI with sophisticated defensive and trapping strategies."""
     
-    def __init__(self, strategy: GoatStrategy = GoatStrategy.DEFENSIVE_BLOCK, difficulty: str = "expert"):
+    player = Player.GOAT
+    strategy_type = GoatStrategy
+    
+    def __init__(self, strategy: GoatStrategy = GoatStrategy.DEFENSIVE_BLOCK, difficulty: str = "expert",
+                 search_depth: Optional[int] = None, seed=None, time_budget: Optional[float] = None):
+        super().__init__(difficulty, search_depth, seed, time_budget)
         self.strategy = strategy
-        self.difficulty = difficulty
-        print(f"🐐 Advanced Goat AI initialized: {strategy.value} ({difficulty})")
+        logger.debug("🐐 Advanced Goat AI initialized: %s (%s)", strategy.value, difficulty)
     
     def select_action(self, env, state: Dict) -> Optional[Tuple]:
         """Enhanced action selection with priority-based decision making."""
-        valid_actions = env.get_valid_actions(Player.GOAT)
-        if not valid_actions:
-            return None
-        
-        # PRIORITY 1: Avoid immediate capture threats
-        safe_actions = self._filter_safe_actions(valid_actions, state)
-        if not safe_actions:
-            print("⚠️ GOAT AI: No safe moves available, looking for escape moves.")
-            # Try to find moves that at least improve the situation
-            escape_actions = self._find_escape_moves(valid_actions, state)
-            safe_actions = escape_actions if escape_actions else valid_actions
-        
-        # PRIORITY 2: Among safe moves, find trapping opportunities
-        trapping_actions = self._find_trapping_moves(safe_actions, state)
-        if trapping_actions:
-            print(f"🎯 GOAT AI: Found {len(trapping_actions)} tiger trapping opportunities!")
-            return self._select_best_trapping_move(trapping_actions, state)
-        
-        # PRIORITY 3: Formation building and strategic positioning
-        return self._select_strategic_move(safe_actions, state)
-    
-    def _filter_safe_actions(self, valid_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Filter out moves that would result in immediate capture."""
-        safe_actions = []
-        board = state['board']
-        
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == PieceType.TIGER.value:
-                    tiger_positions.append((r, c))
+        if self.search_depth > 0:
+            valid_actions = env.get_valid_actions(Player.GOAT)
+            return self._search_best_action(env, valid_actions) if valid_actions else None
         
-        for action in valid_actions:
-            if action[0] == 'place':
-                target_pos = (action[1], action[2])
-            elif action[0] == 'move':
-                target_pos = (action[3], action[4])
-            else:
-                continue
-            
-            if self._is_position_safe(target_pos, tiger_positions, board):
-                safe_actions.append(action)
+        actions = env.get_valid_action_array(Player.GOAT)
+        if not len(actions.kinds):
+            return None
         
-        return safe_actions
-    
-    def _find_escape_moves(self, valid_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Find moves that increase distance from tigers."""
-        escape_moves = []
+        # Whole-board safety and value maps, computed once per turn and read per target square
         board = state['board']
+        tiger_positions = _piece_positions(env, PieceType.TIGER)
+        to_r, to_c = actions.coords[:, 2], actions.coords[:, 3]
+        safe = self._compute_safe_map(board, env)[to_r, to_c]
+        values = self._compute_value_map(tiger_positions, _piece_positions(env, PieceType.GOAT))[to_r, to_c]
         
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == PieceType.TIGER.value:
-                    tiger_positions.append((r, c))
-        
-        for action in valid_actions:
-            if action[0] == 'move':
-                from_pos = (action[1], action[2])
-                to_pos = (action[3], action[4])
-                
-                # Calculate distance improvement
-                old_min_dist = min([abs(from_pos[0] - tp[0]) + abs(from_pos[1] - tp[1]) 
-                                   for tp in tiger_positions] or [999])
-                new_min_dist = min([abs(to_pos[0] - tp[0]) + abs(to_pos[1] - tp[1]) 
-                                   for tp in tiger_positions] or [999])
-                
-                if new_min_dist > old_min_dist:
-                    escape_moves.append(action)
-        
-        return escape_moves
+        # PRIORITY 1: Avoid immediate capture threats
+        candidates = safe
+        if not safe.any():
+            logger.debug("⚠️ GOAT AI: No safe moves available, looking for escape moves.")
+            # Try to find moves that at least improve the situation
+            escape = self._escape_mask(actions, tiger_positions)
+            candidates = escape if escape.any() else np.ones_like(safe)
+        
+        # PRIORITY 2: Among safe moves, take the one that most reduces tiger mobility
+        candidate_idx = np.flatnonzero(candidates)
+        reductions = self._trapping_reductions([actions.to_tuple(i) for i in candidate_idx], board)
+        best = int(np.argmax(reductions))
+        if reductions[best] > 0:
+            logger.debug("🎯 GOAT AI: Found %d tiger trapping opportunities, best reduces tiger mobility by %d",
+                         int(np.count_nonzero(reductions > 0)), int(reductions[best]))
+            return actions.to_tuple(candidate_idx[best])
+        
+        # PRIORITY 3: Formation building and strategic positioning (values are never negative)
+        return actions.to_tuple(int(np.argmax(np.where(candidates, values, -1))))
     
-    def _find_trapping_moves(self, safe_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Find moves that reduce tiger mobility (trapping effect)."""
-        trapping_moves = []
-        board = state['board']
-        
-        current_tiger_mobility = self._calculate_tiger_mobility(board)
-        
-        for action in safe_actions:
-            # Simulate the move
-            temp_board = np.copy(board)
-            
-            if action[0] == 'place':
-                temp_board[action[1], action[2]] = PieceType.GOAT.value
-            elif action[0] == 'move':
-                temp_board[action[1], action[2]] = PieceType.EMPTY.value
-                temp_board[action[3], action[4]] = PieceType.GOAT.value
-            
-            new_tiger_mobility = self._calculate_tiger_mobility(temp_board)
-            
-            # If this move reduces tiger mobility, it's a trapping move
-            if new_tiger_mobility < current_tiger_mobility:
-                trapping_moves.append(action)
-        
-        return trapping_moves
+    def _compute_safe_map(self, board: np.ndarray, env=None) -> np.ndarray:
+        """Boolean 5x5 map of squares a goat can occupy without an immediate tiger jump."""
+        tiger_bb, _, empty_bb = _board_bitboards(board, env)
+        safe_bb = bitboard_safe_squares(tiger_bb, empty_bb, JUMP_SRC, JUMP_DST)
+        return ((safe_bb & SQUARE_BITS) != 0).reshape(5, 5)
     
-    def _select_best_trapping_move(self, trapping_moves: List[Tuple], state: Dict) -> Optional[Tuple]:
-        """Select the move that most reduces tiger mobility."""
-        board = state['board']
-        current_mobility = self._calculate_tiger_mobility(board)
+    def _compute_value_map(self, tiger_positions: np.ndarray, goat_positions: np.ndarray) -> np.ndarray:
+        """Strategic value of every square at once: goat formation, center control and tiger blocking bonuses."""
+        # Strategic positions (edges, corners) and center control
+        value_map = SQUARE_BONUS.copy()
         
-        best_move = None
-        best_reduction = 0
+        # Formation building - bonus for being near other goats
+        if len(goat_positions):
+            goat_distance = (np.abs(_ROWS - goat_positions[:, 0, None, None]) +
+                             np.abs(_COLS - goat_positions[:, 1, None, None]))
+            value_map += 25 * (goat_distance == 1).sum(axis=0) + 10 * (goat_distance == 2).sum(axis=0)
         
-        for action in trapping_moves:
-            temp_board = np.copy(board)
-            
-            if action[0] == 'place':
-                temp_board[action[1], action[2]] = PieceType.GOAT.value
-            elif action[0] == 'move':
-                temp_board[action[1], action[2]] = PieceType.EMPTY.value
-                temp_board[action[3], action[4]] = PieceType.GOAT.value
-            
-            new_mobility = self._calculate_tiger_mobility(temp_board)
-            reduction = current_mobility - new_mobility
-            
-            if reduction > best_reduction:
-                best_reduction = reduction
-                best_move = action
+        # Tiger blocking - maintain distance for effective blocking
+        if len(tiger_positions):
+            tiger_distance = (np.abs(_ROWS - tiger_positions[:, 0, None, None]) +
+                              np.abs(_COLS - tiger_positions[:, 1, None, None]))
+            value_map += 20 * (tiger_distance == 2).sum(axis=0) + 10 * (tiger_distance == 3).sum(axis=0)
         
-        print(f"🎯 GOAT AI: Selected trapping move reducing tiger mobility by {best_reduction}")
-        return best_move
+        return value_map
     
-    def _calculate_tiger_mobility(self, board: np.ndarray) -> int:
-        """Calculate total number of moves available to all tigers."""
-        total_moves = 0
-        
-        # Find tiger positions
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == PieceType.TIGER.value:
-                    tiger_positions.append((r, c))
-        
-        # Count moves for each tiger
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for tr, tc in tiger_positions:
-            for dr, dc in directions:
-                new_r, new_c = tr + dr, tc + dc
-                
-                # Regular move
-                if (0 <= new_r < 5 and 0 <= new_c < 5 and 
-                    board[new_r, new_c] == PieceType.EMPTY.value):
-                    total_moves += 1
-                
-                # Capture move
-                elif (0 <= new_r < 5 and 0 <= new_c < 5 and 
-                      board[new_r, new_c] == PieceType.GOAT.value):
-                    jump_r, jump_c = new_r + dr, new_c + dc
-                    if (0 <= jump_r < 5 and 0 <= jump_c < 5 and 
-                        board[jump_r, jump_c] == PieceType.EMPTY.value):
-                        total_moves += 2  # Captures count more
-        
-        return total_moves
-    
-    def _is_position_safe(self, pos: Tuple[int, int], tiger_positions: List[Tuple], board: np.ndarray) -> bool:
-        """Check if a position is safe from immediate capture."""
-        for tiger_pos in tiger_positions:
-            if self._can_tiger_capture_at_position(tiger_pos, pos, board):
-                return False
-        return True
-    
-    def _can_tiger_capture_at_position(self, tiger_pos: Tuple[int, int], target_pos: Tuple[int, int], board: np.ndarray) -> bool:
-        """Check if tiger can capture at target position."""
-        tr, tc = tiger_pos
-        gr, gc = target_pos
-        
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for dr, dc in directions:
-            # Check if tiger is one step away and can jump over target
-            if (tr + dr == gr and tc + dc == gc):
-                land_r, land_c = gr + dr, gc + dc
-                if (0 <= land_r < 5 and 0 <= land_c < 5 and 
-                    board[land_r, land_c] == PieceType.EMPTY.value):
-                    return True
-        
-        return False
+    def _escape_mask(self, actions: ActionArray, tiger_positions: np.ndarray) -> np.ndarray:
+        """Mask of moves that increase the distance to the nearest tiger."""
+        if not len(tiger_positions):
+            return np.zeros(len(actions.kinds), dtype=bool)
+        
+        tigers = tiger_positions[None, :, :].astype(np.int16)
+        old_min_dist = np.abs(tigers - actions.coords[:, None, 0:2]).sum(axis=2).min(axis=1)
+        new_min_dist = np.abs(tigers - actions.coords[:, None, 2:4]).sum(axis=2).min(axis=1)
+        return (actions.kinds == ACTION_MOVE) & (new_min_dist > old_min_dist)
     
-    def _select_strategic_move(self, safe_actions: List[Tuple], state: Dict) -> Optional[Tuple]:
-        """Select move based on strategic value with enhanced formation building."""
-        if not safe_actions:
-            return None
-        
-        board = state['board']
-        
-        # Get positions of all pieces
-        tiger_positions = []
-        goat_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == PieceType.TIGER.value:
-                    tiger_positions.append((r, c))
-                elif board[r, c] == PieceType.GOAT.value:
-                    goat_positions.append((r, c))
-        
-        best_action = None
-        best_score = -999
-        
-        for action in safe_actions:
+    def _trapping_reductions(self, candidates: List[Tuple], board: np.ndarray) -> np.ndarray:
+        """Tiger mobility reduction of each candidate move (positive means a trapping move)."""
+        board_key = self._board_key(board)
+        current_tiger_mobility = self._cached_tiger_mobility(board_key, board)
+        reductions = np.zeros(len(candidates), dtype=np.int32)
+        # One copy per call that every candidate is made and unmade on; it stays local so concurrent
+        # searches with a shared agent never simulate on the same board
+        temp_board = np.array(board, dtype=np.int8)
+        
+        for i, action in enumerate(candidates):
+            # Simulate the move in place and undo it afterwards
             if action[0] == 'place':
-                target_pos = (action[1], action[2])
-            elif action[0] == 'move':
-                target_pos = (action[3], action[4])
+                temp_board[action[1], action[2]] = _GOAT
             else:
-                continue
+                temp_board[action[1], action[2]] = _EMPTY
+                temp_board[action[3], action[4]] = _GOAT
             
-            score = self._calculate_position_value(target_pos, tiger_positions, goat_positions, board)
+            reductions[i] = current_tiger_mobility - self._cached_tiger_mobility(
+                self._goat_action_key(board_key, action), temp_board)
             
-            if score > best_score:
-                best_score = score
-                best_action = action
+            temp_board[action[-2], action[-1]] = _EMPTY
+            if action[0] == 'move':
+                temp_board[action[1], action[2]] = _GOAT
         
-        return best_action if best_action else safe_actions[0]
+        return reductions
+    
+    def _action_order_scores(self, env, actions: List[Tuple]) -> List[int]:
+        """Order goat moves in the search by positional value, pushing unsafe targets last."""
+        # Unsafe squares lose 1000 points so they sort after every safe target
+        score_map = (self._compute_value_map(env.tiger_positions[:env.tiger_count],
+                                             env.goat_positions[:env.goat_count]) -
+                     1000 * ~self._compute_safe_map(env.board, env)).tolist()
+        return [score_map[a[1]][a[2]] if a[0] == 'place' else score_map[a[3]][a[4]] for a in actions]
     
-    def _calculate_position_value(self, pos: Tuple[int, int], tiger_positions: List[Tuple], 
-                                goat_positions: List[Tuple], board: np.ndarray) -> int:
-        """Calculate strategic value of a position."""
-        value = 0
-        
-        # Formation building - bonus for being near other goats
-        for goat_pos in goat_positions:
-            distance = abs(pos[0] - goat_pos[0]) + abs(pos[1] - goat_pos[1])
-            if distance == 1:
-                value += 25  # Strong formation bonus
-            elif distance == 2:
-                value += 10  # Proximity bonus
-        
-        # Strategic positions
-        if pos in [(0, 0), (0, 4), (4, 0), (4, 4)]:  # Corners
-            value += 15
-        elif pos[0] == 0 or pos[0] == 4 or pos[1] == 0 or pos[1] == 4:  # Edges
-            value += 10
-        
-        # Center control
-        if pos == (2, 2):
-            value += 20
-        elif pos[0] in [1, 2, 3] and pos[1] in [1, 2, 3]:
-            value += 8
-        
-        # Tiger blocking - maintain distance for effective blocking
-        for tiger_pos in tiger_positions:
-            distance = abs(pos[0] - tiger_pos[0]) + abs(pos[1] - tiger_pos[1])
-            if distance == 2:
-                value += 20  # Optimal blocking distance
-            elif distance == 3:
-                value += 10  # Still useful
-        
-        return value
-
 if __name__ == "__main__":
     print("🎉 Advanced Baghchal AI System ready!") 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Training analysis for the Baghchal AI
+Plots self-play results, either passed in by training.py or read from its JSON output:
+
+    python -m app.ai.analyze training_results.json [output.png]
+"""
+
+import json
+import sys
+from typing import Dict, List
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+def _winner_name(winner) -> str:
+    """'TIGER' / 'GOAT' / 'None' for a Player enum or its JSON-serialized name."""
+    return getattr(winner, 'name', None) or str(winner).split('.')[-1]
+
+def load_results(path: str) -> List[Dict]:
+    """Game summaries from training_results.json or a training checkpoint."""
+    with open(path) as f:
+        return json.load(f)['results']
+
+def create_training_visualizations(results: List[Dict], strategy_stats: Dict,
+                                   filename: str = 'advanced_training_analysis.png'):
+    """Create training analysis visualizations."""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Win rate over time
+    episodes = [r['episode'] for r in results]
+    tiger_wins_cumulative = []
+    running_tiger_wins = 0
+
+    for i, result in enumerate(results):
+        if _winner_name(result['winner']) == 'TIGER':
+            running_tiger_wins += 1
+        tiger_wins_cumulative.append((running_tiger_wins / (i + 1)) * 100)
+
+    ax1.plot(episodes, tiger_wins_cumulative, label='Tiger Win Rate', color='orange')
+    ax1.set_xlabel('Episode')
+    ax1.set_ylabel('Win Rate (%)')
+    ax1.set_title('Tiger Win Rate Over Time')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    # Game length distribution
+    game_lengths = [r['moves_played'] for r in results]
+    ax2.hist(game_lengths, bins=30, alpha=0.7, color='blue', edgecolor='black')
+    ax2.set_xlabel('Game Length (moves)')
+    ax2.set_ylabel('Frequency')
+    ax2.set_title('Game Length Distribution')
+    ax2.grid(True, alpha=0.3)
+
+    # Strategy performance
+    tiger_strategies = list(strategy_stats['tiger_strategies'].keys())
+    tiger_win_rates = [strategy_stats['tiger_strategies'][s]['win_rate'] for s in tiger_strategies]
+
+    ax3.bar(tiger_strategies, tiger_win_rates, color='orange', alpha=0.7)
+    ax3.set_ylabel('Win Rate (%)')
+    ax3.set_title('Tiger Strategy Performance')
+    ax3.tick_params(axis='x', rotation=45)
+
+    # Capture distribution
+    tiger_games = [r for r in results if _winner_name(r['winner']) == 'TIGER']
+    if tiger_games:
+        captures = [r['captures_made'] for r in tiger_games]
+        ax4.hist(captures, bins=range(1, max(captures) + 2), alpha=0.7, color='red', edgecolor='black')
+        ax4.set_xlabel('Captures Made')
+        ax4.set_ylabel('Frequency')
+        ax4.set_title('Captures in Tiger Wins')
+        ax4.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"📊 Training analysis saved as '{filename}'")
+    plt.close()
+
+def plot_training_curves(results: List[Dict], filename: str):
+    """Generates and saves a plot of the training results."""
+    episodes = [r['episode'] for r in results]
+    moves = [r['moves_played'] for r in results]
+
+    tiger_wins = [1 if _winner_name(r.get('winner')) == 'TIGER' else 0 for r in results]
+    goat_wins = [1 if _winner_name(r.get('winner')) == 'GOAT' else 0 for r in results]
+
+    # Calculate moving averages
+    window = 100
+    tiger_win_rate = pd.Series(tiger_wins).rolling(window=window).mean()
+    goat_win_rate = pd.Series(goat_wins).rolling(window=window).mean()
+    avg_moves = pd.Series(moves).rolling(window=window).mean()
+
+    fig, ax1 = plt.subplots(figsize=(12, 7))
+
+    ax1.set_xlabel('Episode')
+    ax1.set_ylabel('Win Rate (Moving Average)')
+    ax1.plot(episodes, tiger_win_rate, 'r-', label='Tiger Win Rate')
+    ax1.plot(episodes, goat_win_rate, 'g-', label='Goat Win Rate')
+    ax1.tick_params(axis='y')
+    ax1.legend(loc='upper left')
+    ax1.set_ylim(0, 1)
+
+    ax2 = ax1.twinx()
+    ax2.set_ylabel('Average Game Length (Moving Average)', color='b')
+    ax2.plot(episodes, avg_moves, 'b-', label='Avg Game Length')
+    ax2.tick_params(axis='y', labelcolor='b')
+    ax2.legend(loc='upper right')
+
+    fig.tight_layout()
+    plt.title('Advanced AI Training Analysis')
+    plt.savefig(filename)
+    plt.close()
+    print(f"\n📊 Training analysis saved as '{filename}'")
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m app.ai.analyze <training_results.json> [output.png]")
+        sys.exit(1)
+    
+    results = load_results(sys.argv[1])
+    filename = sys.argv[2] if len(sys.argv) > 2 else "advanced_training_analysis.png"
+    plot_training_curves(results, filename)
+
+if __name__ == "__main__":
+    main()
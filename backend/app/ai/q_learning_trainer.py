@@ -15,7 +15,7 @@ import pandas as pd
 from collections import deque, defaultdict
 
 from .double_q_learning import QLearningConfig
-from .q_learning_agents import DoubleQLearningTigerAI, DoubleQLearningGoatAI
+from .q_learning_agents import DoubleQLearningTigerAI, DoubleQLearningGoatAI, log_winning_action_cache_stats
 
 try:
     from ..core.baghchal_env import BaghchalEnv, Player, GamePhase
@@ -118,6 +118,7 @@ class QLearningTrainer:
         self._generate_training_report(save_path)
         
         print(f"🏁 Training completed! Models saved to {save_path}")
+        log_winning_action_cache_stats()
     
     def _initialize_training_agents(self):
         """Initialize agents with training-optimized configurations."""
@@ -196,31 +197,35 @@ class QLearningTrainer:
                 old_state = state.copy()  # Actually current state
                 dummy_action = ('no_move',)
                 done = True
+                # Old and new state are the same here, so one key serves both
+                state_key = agent.state_encoder.encode_state(old_state, agent.player)
                 
                 if current_player == Player.TIGER:
                     reward = self.tiger_agent.calculate_reward(old_state, state, dummy_action)
-                    tiger_experience.append((old_state, dummy_action, reward, state, done))
+                    tiger_experience.append((old_state, dummy_action, reward, state, done, state_key, state_key))
                 else:
                     reward = self.goat_agent.calculate_reward(old_state, state, dummy_action)
-                    goat_experience.append((old_state, dummy_action, reward, state, done))
+                    goat_experience.append((old_state, dummy_action, reward, state, done, state_key, state_key))
                 
                 break
             
-            # Store current state for learning
+            # Store current state for learning, encoded once for the log and the Q update
             old_state = state.copy()
+            state_key = agent.state_encoder.encode_state(old_state, current_player)
             
             # Execute action
             new_state, step_reward, done, info = self.env.step(action)
+            next_state_key = agent.state_encoder.encode_state(new_state, current_player)
             
             # Calculate agent-specific rewards
             if current_player == Player.TIGER:
                 reward = self.tiger_agent.calculate_reward(old_state, new_state, action)
                 tiger_episode_reward += reward
-                tiger_experience.append((old_state, action, reward, new_state, done))
+                tiger_experience.append((old_state, action, reward, new_state, done, state_key, next_state_key))
             else:
                 reward = self.goat_agent.calculate_reward(old_state, new_state, action)
                 goat_episode_reward += reward
-                goat_experience.append((old_state, action, reward, new_state, done))
+                goat_experience.append((old_state, action, reward, new_state, done, state_key, next_state_key))
             
             # Log move
             game_log.append({
@@ -228,7 +233,7 @@ class QLearningTrainer:
                 'player': current_player.name,
                 'action': action,
                 'reward': reward,
-                'state_hash': agent.state_encoder.encode_state(old_state, current_player)
+                'state_hash': state_key
             })
             
             state = new_state
@@ -257,12 +262,14 @@ class QLearningTrainer:
     def _update_agents_from_experience(self, tiger_experience: List, goat_experience: List):
         """Update Q-values for both agents from their collected experience."""
         # Update tiger agent
-        for old_state, action, reward, new_state, done in tiger_experience:
-            self.tiger_agent.update_q_values(old_state, action, reward, new_state, done)
+        for old_state, action, reward, new_state, done, state_key, next_state_key in tiger_experience:
+            self.tiger_agent.update_q_values(old_state, action, reward, new_state, done,
+                                             state_key, next_state_key)
         
         # Update goat agent
-        for old_state, action, reward, new_state, done in goat_experience:
-            self.goat_agent.update_q_values(old_state, action, reward, new_state, done)
+        for old_state, action, reward, new_state, done, state_key, next_state_key in goat_experience:
+            self.goat_agent.update_q_values(old_state, action, reward, new_state, done,
+                                            state_key, next_state_key)
     
     def _update_training_stats(self, game_result: Dict, episode: int):
         """Update training statistics with game result."""
@@ -377,8 +384,8 @@ class QLearningTrainer:
     def _save_progress(self, save_path: Path, episode: int):
         """Save training progress and intermediate models."""
         # Save agent models
-        tiger_path = save_path / f"tiger_episode_{episode}.pkl"
-        goat_path = save_path / f"goat_episode_{episode}.pkl"
+        tiger_path = save_path / f"tiger_episode_{episode}.npz"
+        goat_path = save_path / f"goat_episode_{episode}.npz"
         
         self.tiger_agent.save_model(str(tiger_path))
         self.goat_agent.save_model(str(goat_path))
@@ -409,8 +416,8 @@ class QLearningTrainer:
     def _save_final_models(self, save_path: Path):
         """Save final trained models."""
         # Save final models with standard names
-        tiger_final_path = save_path / "enhanced_tiger_dual.pkl"
-        goat_final_path = save_path / "enhanced_goat_dual.pkl"
+        tiger_final_path = save_path / "enhanced_tiger_dual.npz"
+        goat_final_path = save_path / "enhanced_goat_dual.npz"
         
         self.tiger_agent.save_model(str(tiger_final_path))
         self.goat_agent.save_model(str(goat_final_path))
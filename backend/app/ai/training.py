@@ -5,14 +5,16 @@ Self-play training with strategic evaluation and model saving
 
 import numpy as np
 import random
-import pickle
 import json
+import os
+import logging
+import math
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
-import matplotlib.pyplot as plt
 from datetime import datetime
 import sys
-import pandas as pd
 
 # Add backend path for imports
 sys.path.append(str(Path(__file__).parent / "backend"))
@@ -23,11 +25,143 @@ try:
 except ImportError as e:
     print(f"Warning: Could not import dependencies: {e}")
 
+logger = logging.getLogger(__name__)
+
+def _play_one(task: Tuple) -> Dict:
+    """Self-play worker entry point: play one seeded game from strategy enums."""
+    episode, seed, tiger_strategy, goat_strategy, log_moves = task
+    
+    # Fresh agents per game so no transposition table or mobility cache carries over from an earlier
+    # task; the result then depends only on the task, not on which worker played what before it
+    tiger_seed, goat_seed = np.random.SeedSequence(seed).spawn(2)
+    tiger_agent = AdvancedTigerAI(tiger_strategy, "expert", seed=tiger_seed)
+    goat_agent = AdvancedGoatAI(goat_strategy, "expert", seed=goat_seed)
+    return play_training_game(BaghchalEnv(), tiger_agent, goat_agent, episode, log_moves)
+
+def play_training_game(env: BaghchalEnv, tiger_agent: AdvancedTigerAI, goat_agent: AdvancedGoatAI, episode: int,
+                       log_moves: bool = False) -> Dict:
+    """Play a single training game between agents; the per-move game_log is only kept when log_moves is set."""
+    state = env.reset()
+    moves_played = 0
+    captures_made = 0
+    errors = 0
+    last_error = None
+    game_log = []
+    
+    while not state['game_over'] and moves_played < 200:  # Prevent infinite games
+        current_player = state['current_player']
+        
+        try:
+            agent = tiger_agent if current_player == Player.TIGER else goat_agent
+            action = agent.select_action(env, state)
+            
+            if action is None:
+                logger.debug("⚠️ No valid action for %s at move %d", current_player, moves_played)
+                break
+            
+            # Record captures before move
+            captures_before = state.get('goats_captured', 0)
+            
+            # Execute action
+            state, reward, done, info = env.step(action)
+            
+            # Track captures
+            captures_after = state.get('goats_captured', 0)
+            if captures_after > captures_before:
+                captures_made += 1
+            
+            # Log move
+            if log_moves:
+                game_log.append({
+                    'move': moves_played,
+                    'player': current_player,
+                    'agent': f"{'Tiger' if agent is tiger_agent else 'Goat'} ({agent.strategy.value})",
+                    'action': action,
+                    'captures': captures_after,
+                    'phase': state.get('phase', 'unknown')
+                })
+            
+            moves_played += 1
+            
+        except Exception as e:
+            errors += 1
+            last_error = e
+            break
+    
+    if errors:
+        logger.warning("❌ %d error(s) in game %d, last at move %d: %s", errors, episode, moves_played, last_error)
+    
+    # Analyze game result
+    winner = state.get('winner', 'draw')
+    logger.debug("Game %d: phase=%s, goats_placed=%s, goats_captured=%s, winner=%s",
+                 episode, state.get('phase'), state.get('goats_placed'), state.get('goats_captured'), winner)
+    game_result = {
+        'episode': episode,
+        'winner': winner,
+        'moves_played': moves_played,
+        'captures_made': captures_made,
+        'errors': errors,
+        'tiger_strategy': tiger_agent.strategy.value,
+        'goat_strategy': goat_agent.strategy.value,
+        'game_log': game_log,
+        'final_state': {
+            'goats_captured': state.get('goats_captured', 0),
+            'goats_placed': state.get('goats_placed', 0),
+            'phase': state.get('phase', 'unknown')
+        }
+    }
+    
+    return game_result
+
+class RunningStat:
+    """Count, sum, min, max and (population) std of a stream of numbers, updated in O(1)."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = None
+        self.max = None
+    
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+    
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self.total_sq / self.count - self.mean ** 2, 0.0)) if self.count else 0
+
+def summarize_game_result(result: Dict) -> Dict:
+    """JSON-serializable summary of a game result (no move log), as read back by analyze.py."""
+    return {
+        'episode': result['episode'],
+        'winner': result['winner'].name if hasattr(result['winner'], 'name') else str(result['winner']),
+        'moves_played': result['moves_played'],
+        'captures_made': result['captures_made'],
+        'tiger_strategy': result['tiger_strategy'],
+        'goat_strategy': result['goat_strategy'],
+        'final_state': {
+            'goats_captured': result['final_state']['goats_captured'],
+            'goats_placed': result['final_state']['goats_placed'],
+            'phase': result['final_state']['phase'].name if hasattr(result['final_state']['phase'], 'name') else str(result['final_state']['phase'])
+        }
+    }
+
 class AdvancedTrainingSystem:
     """Advanced training system for Baghchal AI agents."""
     
-    def __init__(self):
+    def __init__(self, log_moves: bool = False, log_sample_rate: float = 0.01):
         self.env = BaghchalEnv()
+        # Per-move game logs are opt-in: every game with log_moves, otherwise a small random sample
+        self.log_moves = log_moves
+        self.log_sample_rate = log_sample_rate
         self.training_stats = {
             'tiger_wins': 0,
             'goat_wins': 0,
@@ -38,33 +172,67 @@ class AdvancedTrainingSystem:
         }
         self.game_history = []
         
+        # Per-strategy and distribution stats, updated per game so analysis never re-walks the results
+        self.tiger_strategy_stats = defaultdict(lambda: {'games': 0, 'wins': 0, 'captures': RunningStat()})
+        self.goat_strategy_stats = defaultdict(lambda: {'games': 0, 'wins': 0, 'game_length': RunningStat()})
+        self.game_length_stats = RunningStat()
+        self.tiger_win_captures = RunningStat()
+        self.quick_tiger_wins = 0
+        self.five_capture_wins = 0
+        
         print("🎯 Advanced Training System initialized")
     
-    def train_agents(self, episodes: int = 1000, save_interval: int = 250):
-        """Train agents using self-play with advanced evaluation."""
-        print(f"🚀 Starting advanced training for {episodes} episodes...")
-        
-        # Initialize agents with different strategies
-        tiger_agents = [
-            AdvancedTigerAI(TigerStrategy.AGGRESSIVE_HUNT, "expert"),
-            AdvancedTigerAI(TigerStrategy.CENTER_DOMINANCE, "expert"),
-            AdvancedTigerAI(TigerStrategy.OPPORTUNISTIC, "expert")
-        ]
-        
-        goat_agents = [
-            AdvancedGoatAI(GoatStrategy.DEFENSIVE_BLOCK, "expert"),
-            AdvancedGoatAI(GoatStrategy.CENTER_CONTROL, "expert"),
-            AdvancedGoatAI(GoatStrategy.TIGER_CONTAINMENT, "expert")
-        ]
+    def train_agents(self, episodes: int = 1000, save_interval: int = 250, n_jobs: Optional[int] = None,
+                     seed: Optional[int] = None):
+        """
+        Train agents using self-play with advanced evaluation.
+        
+        Games are independent, so they are spread over n_jobs worker processes
+        (default: all cores; 1 plays in-process). Workers get strategy enums and
+        a per-episode seed and build their own agents; results come back in
+        episode order and are aggregated here.
+        """
+        n_jobs = n_jobs or os.cpu_count() or 1
+        print(f"🚀 Starting advanced training for {episodes} episodes on {n_jobs} worker(s)...")
+        
+        # Strategies to sample from
+        tiger_strategies = [TigerStrategy.AGGRESSIVE_HUNT, TigerStrategy.CENTER_DOMINANCE, TigerStrategy.OPPORTUNISTIC]
+        goat_strategies = [GoatStrategy.DEFENSIVE_BLOCK, GoatStrategy.CENTER_CONTROL, GoatStrategy.TIGER_CONTAINMENT]
+        
+        rng = random.Random(seed)
+        tasks = [(episode, rng.getrandbits(63), rng.choice(tiger_strategies), rng.choice(goat_strategies),
+                  self.log_moves or rng.random() < self.log_sample_rate)
+                 for episode in range(1, episodes + 1)]
         
         episode_results = []
         
-        # Run training episodes
-        for episode in range(1, episodes + 1):
-            tiger_agent = random.choice(tiger_agents)
-            goat_agent = random.choice(goat_agents)
-            
-            game_result = self._play_training_game(tiger_agent, goat_agent, episode)
+        if n_jobs == 1:
+            game_results = map(_play_one, tasks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+            game_results = executor.map(_play_one, tasks, chunksize=max(1, episodes // (n_jobs * 8)))
+        
+        try:
+            self._collect_training_results(game_results, episode_results, episodes, save_interval)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        # Summaries of every game, for offline plotting with analyze.py
+        with open("training_results.json", 'w') as f:
+            json.dump({'episodes': episodes, 'results': [summarize_game_result(r) for r in episode_results]}, f)
+        
+        # Final analysis after all episodes
+        final_analysis = self._analyze_training_results(episode_results)
+        self._run_analysis(episode_results, "advanced_training_analysis.png")
+        
+        return final_analysis
+    
+    def _collect_training_results(self, game_results, episode_results: List[Dict], episodes: int, save_interval: int):
+        """Aggregate finished games in episode order: stats, progress logs and checkpoints."""
+        for game_result in game_results:
+            episode = game_result['episode']
             episode_results.append(game_result)
             
             # Update statistics
@@ -91,91 +259,40 @@ class AdvancedTrainingSystem:
                     print(f"   Tiger wins (last {window_size}): {tiger_wins} ({tiger_wins/total_games_in_window:.1%})")
                     print(f"   Goat wins (last {window_size}): {goat_wins} ({goat_wins/total_games_in_window:.1%})")
                     print(f"   Avg game length (last {window_size}): {avg_game_len:.1f} moves")
-
-        # Final analysis after all episodes
-        final_analysis = self._analyze_training_results(episode_results)
-        self._run_analysis(episode_results, "advanced_training_analysis.png")
-        
-        return final_analysis
     
     def _play_training_game(self, tiger_agent: AdvancedTigerAI, goat_agent: AdvancedGoatAI, episode: int) -> Dict:
-        """Play a single training game between agents."""
-        state = self.env.reset()
-        moves_played = 0
-        captures_made = 0
-        game_log = []
-        
-        while not state['game_over'] and moves_played < 200:  # Prevent infinite games
-            current_player = state['current_player']
-            
-            try:
-                if current_player == Player.TIGER:
-                    action = tiger_agent.select_action(self.env, state)
-                    agent_type = f"Tiger ({tiger_agent.strategy.value})"
-                else:
-                    action = goat_agent.select_action(self.env, state)
-                    agent_type = f"Goat ({goat_agent.strategy.value})"
-                
-                if action is None:
-                    print(f"⚠️ No valid action for {current_player} at move {moves_played}")
-                    break
-                
-                # Record captures before move
-                captures_before = state.get('goats_captured', 0)
-                
-                # Execute action
-                state, reward, done, info = self.env.step(action)
-                
-                # Track captures
-                captures_after = state.get('goats_captured', 0)
-                if captures_after > captures_before:
-                    captures_made += 1
-                
-                # Log move
-                game_log.append({
-                    'move': moves_played,
-                    'player': current_player,
-                    'agent': agent_type,
-                    'action': action,
-                    'captures': captures_after,
-                    'phase': state.get('phase', 'unknown')
-                })
-                
-                moves_played += 1
-                
-            except Exception as e:
-                print(f"❌ Error in game {episode}, move {moves_played}: {e}")
-                break
-        
-        # Analyze game result
-        winner = state.get('winner', 'draw')
-        print(f"[DEBUG] Game {episode}: phase={state.get('phase')}, goats_placed={state.get('goats_placed')}, goats_captured={state.get('goats_captured')}, winner={winner}")
-        game_result = {
-            'episode': episode,
-            'winner': winner,
-            'moves_played': moves_played,
-            'captures_made': captures_made,
-            'tiger_strategy': tiger_agent.strategy.value,
-            'goat_strategy': goat_agent.strategy.value,
-            'game_log': game_log,
-            'final_state': {
-                'goats_captured': state.get('goats_captured', 0),
-                'goats_placed': state.get('goats_placed', 0),
-                'phase': state.get('phase', 'unknown')
-            }
-        }
-        
-        return game_result
+        """Play a single training game between agents on this system's env."""
+        return play_training_game(self.env, tiger_agent, goat_agent, episode, self.log_moves)
     
     def _update_training_stats(self, game_result: Dict):
         """Update overall training statistics."""
         self.training_stats['games_played'] += 1
         
-        if game_result['winner'] == 'tigers':
+        tiger_won = game_result['winner'] == Player.TIGER
+        goat_won = game_result['winner'] == Player.GOAT
+        if tiger_won:
             self.training_stats['tiger_wins'] += 1
-        elif game_result['winner'] == 'goats':
+        elif goat_won:
             self.training_stats['goat_wins'] += 1
         
+        # Per-strategy counters
+        tiger_stats = self.tiger_strategy_stats[game_result['tiger_strategy']]
+        tiger_stats['games'] += 1
+        tiger_stats['wins'] += tiger_won
+        tiger_stats['captures'].add(game_result['captures_made'])
+        
+        goat_stats = self.goat_strategy_stats[game_result['goat_strategy']]
+        goat_stats['games'] += 1
+        goat_stats['wins'] += goat_won
+        goat_stats['game_length'].add(game_result['moves_played'])
+        
+        # Distributions for the final analysis
+        self.game_length_stats.add(game_result['moves_played'])
+        if tiger_won:
+            self.tiger_win_captures.add(game_result['captures_made'])
+            self.five_capture_wins += game_result['captures_made'] >= 5
+            self.quick_tiger_wins += game_result['moves_played'] < 50
+        
         # Update running averages
         total_games = self.training_stats['games_played']
         current_avg_length = self.training_stats['average_game_length']
@@ -186,7 +303,7 @@ class AdvancedTrainingSystem:
         )
         
         # Update capture efficiency
-        if game_result['winner'] == 'tigers':
+        if tiger_won:
             captures = game_result['captures_made']
             self.training_stats['capture_efficiency'] = (
                 (self.training_stats['capture_efficiency'] * (self.training_stats['tiger_wins'] - 1) + 
@@ -207,27 +324,10 @@ class AdvancedTrainingSystem:
     
     def _save_training_checkpoint(self, episode: int, results: List[Dict]):
         """Save training checkpoint."""
-        # Create simplified results for JSON serialization
-        simplified_results = []
         recent_results = results[-50:] if len(results) > 50 else results
-        for result in recent_results:
-            simplified_result = {
-                'episode': result['episode'],
-                'winner': result['winner'].name if hasattr(result['winner'], 'name') else str(result['winner']),
-                'moves_played': result['moves_played'],
-                'captures_made': result['captures_made'],
-                'tiger_strategy': result['tiger_strategy'],
-                'goat_strategy': result['goat_strategy'],
-                'final_state': {
-                    'goats_captured': result['final_state']['goats_captured'],
-                    'goats_placed': result['final_state']['goats_placed'],
-                    'phase': result['final_state']['phase'].name if hasattr(result['final_state']['phase'], 'name') else str(result['final_state']['phase'])
-                }
-            }
-            simplified_results.append(simplified_result)
         checkpoint_data = {
             'episode': episode,
-            'results': simplified_results
+            'results': [summarize_game_result(result) for result in recent_results]
         }
         checkpoint_path = Path(f"training_checkpoint_{episode}.json")
         with open(checkpoint_path, 'w') as f:
@@ -242,9 +342,9 @@ class AdvancedTrainingSystem:
             return {}
 
         print("\n🏆 FINAL TRAINING RESULTS:")
-        total_games = len(results)
-        tiger_wins = sum(1 for r in results if str(r.get('winner')) == 'Player.TIGER')
-        goat_wins = sum(1 for r in results if str(r.get('winner')) == 'Player.GOAT')
+        total_games = self.training_stats['games_played']
+        tiger_wins = self.training_stats['tiger_wins']
+        goat_wins = self.training_stats['goat_wins']
         draws = total_games - tiger_wins - goat_wins
         
         if total_games > 0:
@@ -252,14 +352,13 @@ class AdvancedTrainingSystem:
             print(f"Tiger win rate: {tiger_wins/total_games:.1%}")
             print(f"Goat win rate: {goat_wins/total_games:.1%}")
             print(f"Draws: {draws/total_games:.1%}")
-            avg_game_len = sum(r['moves_played'] for r in results) / total_games
-            print(f"Average game length: {avg_game_len:.1f} moves")
+            print(f"Average game length: {self.game_length_stats.mean:.1f} moves")
         
         # Strategy performance analysis
         strategy_stats = self._analyze_strategy_performance(results)
         
         # Game length analysis
-        game_lengths = [r['moves_played'] for r in results]
+        game_lengths = self.game_length_stats
         
         # Capture analysis
         capture_stats = self._analyze_capture_patterns(results)
@@ -268,15 +367,15 @@ class AdvancedTrainingSystem:
         self._create_training_visualizations(results, strategy_stats)
         
         final_analysis = {
-            'total_games': len(results),
+            'total_games': total_games,
             'overall_stats': self.training_stats,
             'strategy_performance': strategy_stats,
             'capture_analysis': capture_stats,
             'game_length_stats': {
-                'min': min(game_lengths),
-                'max': max(game_lengths),
-                'mean': np.mean(game_lengths),
-                'std': np.std(game_lengths)
+                'min': game_lengths.min,
+                'max': game_lengths.max,
+                'mean': game_lengths.mean,
+                'std': game_lengths.std
             }
         }
         
@@ -295,22 +394,19 @@ class AdvancedTrainingSystem:
         best_tiger_agent = AdvancedTigerAI(TigerStrategy(best_tiger_strategy), "expert")
         best_goat_agent = AdvancedGoatAI(GoatStrategy(best_goat_strategy), "expert")
         
-        with open(model_path / 'advanced_tiger_ai.pkl', 'wb') as f:
-            pickle.dump(best_tiger_agent, f)
-        
-        with open(model_path / 'advanced_goat_ai.pkl', 'wb') as f:
-            pickle.dump(best_goat_agent, f)
+        best_tiger_agent.save_config(model_path / 'advanced_tiger_ai.json')
+        best_goat_agent.save_config(model_path / 'advanced_goat_ai.json')
 
         print("🎯 Final models saved:")
         print(f"   Best Tiger strategy: {best_tiger_strategy}")
         print(f"   Best Goat strategy: {best_goat_strategy}")
-        print(f"   Models: {model_path / 'advanced_tiger_ai.pkl'}, {model_path / 'advanced_goat_ai.pkl'}")
+        print(f"   Models: {model_path / 'advanced_tiger_ai.json'}, {model_path / 'advanced_goat_ai.json'}")
         print(f"   Analysis: {analysis_file}")
         
         return final_analysis
     
     def _analyze_strategy_performance(self, results: List[Dict]) -> Dict:
-        """Analyze performance of different strategies."""
+        """Analyze performance of different strategies from the per-game counters."""
         strategy_stats = {
             'tiger_strategies': {},
             'goat_strategies': {}
@@ -318,139 +414,69 @@ class AdvancedTrainingSystem:
         
         # Tiger strategy analysis
         for strategy in TigerStrategy:
-            games = [r for r in results if r['tiger_strategy'] == strategy.value]
-            wins = len([r for r in games if r['winner'] == 'tigers'])
+            stats = self.tiger_strategy_stats.get(strategy.value)
+            games = stats['games'] if stats else 0
+            wins = stats['wins'] if stats else 0
             
             strategy_stats['tiger_strategies'][strategy.value] = {
-                'games_played': len(games),
+                'games_played': games,
                 'wins': wins,
-                'win_rate': (wins / len(games)) * 100 if games else 0,
-                'avg_captures': np.mean([r['captures_made'] for r in games]) if games else 0
+                'win_rate': (wins / games) * 100 if games else 0,
+                'avg_captures': stats['captures'].mean if games else 0
             }
         
         # Goat strategy analysis
         for strategy in GoatStrategy:
-            games = [r for r in results if r['goat_strategy'] == strategy.value]
-            wins = len([r for r in games if r['winner'] == 'goats'])
+            stats = self.goat_strategy_stats.get(strategy.value)
+            games = stats['games'] if stats else 0
+            wins = stats['wins'] if stats else 0
             
             strategy_stats['goat_strategies'][strategy.value] = {
-                'games_played': len(games),
+                'games_played': games,
                 'wins': wins,
-                'win_rate': (wins / len(games)) * 100 if games else 0,
-                'avg_game_length': np.mean([r['moves_played'] for r in games]) if games else 0
+                'win_rate': (wins / games) * 100 if games else 0,
+                'avg_game_length': stats['game_length'].mean if games else 0
             }
         
         return strategy_stats
     
     def _analyze_capture_patterns(self, results: List[Dict]) -> Dict:
-        """Analyze capture patterns in games."""
-        tiger_wins = [r for r in results if r['winner'] == 'tigers']
+        """Analyze capture patterns in games from the per-game counters."""
+        captures = self.tiger_win_captures
         
-        if not tiger_wins:
+        if not captures.count:
             return {'no_tiger_wins': True}
         
-        captures_distribution = [r['captures_made'] for r in tiger_wins]
-        
         return {
-            'avg_captures_to_win': np.mean(captures_distribution),
-            'min_captures_to_win': min(captures_distribution),
-            'max_captures_to_win': max(captures_distribution),
-            'captures_std': np.std(captures_distribution),
-            'games_with_5_captures': len([c for c in captures_distribution if c >= 5]),
-            'quick_wins': len([r for r in tiger_wins if r['moves_played'] < 50])
+            'avg_captures_to_win': captures.mean,
+            'min_captures_to_win': captures.min,
+            'max_captures_to_win': captures.max,
+            'captures_std': captures.std,
+            'games_with_5_captures': self.five_capture_wins,
+            'quick_wins': self.quick_tiger_wins
         }
     
     def _create_training_visualizations(self, results: List[Dict], strategy_stats: Dict):
-        """Create training analysis visualizations."""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-        
-        # Win rate over time
-        episodes = [r['episode'] for r in results]
-        tiger_wins_cumulative = []
-        running_tiger_wins = 0
-        
-        for i, result in enumerate(results):
-            if result['winner'] == 'tigers':
-                running_tiger_wins += 1
-            tiger_wins_cumulative.append((running_tiger_wins / (i + 1)) * 100)
-        
-        ax1.plot(episodes, tiger_wins_cumulative, label='Tiger Win Rate', color='orange')
-        ax1.set_xlabel('Episode')
-        ax1.set_ylabel('Win Rate (%)')
-        ax1.set_title('Tiger Win Rate Over Time')
-        ax1.grid(True, alpha=0.3)
-        ax1.legend()
-        
-        # Game length distribution
-        game_lengths = [r['moves_played'] for r in results]
-        ax2.hist(game_lengths, bins=30, alpha=0.7, color='blue', edgecolor='black')
-        ax2.set_xlabel('Game Length (moves)')
-        ax2.set_ylabel('Frequency')
-        ax2.set_title('Game Length Distribution')
-        ax2.grid(True, alpha=0.3)
-        
-        # Strategy performance
-        tiger_strategies = list(strategy_stats['tiger_strategies'].keys())
-        tiger_win_rates = [strategy_stats['tiger_strategies'][s]['win_rate'] for s in tiger_strategies]
-        
-        ax3.bar(tiger_strategies, tiger_win_rates, color='orange', alpha=0.7)
-        ax3.set_ylabel('Win Rate (%)')
-        ax3.set_title('Tiger Strategy Performance')
-        ax3.tick_params(axis='x', rotation=45)
-        
-        # Capture distribution
-        tiger_games = [r for r in results if r['winner'] == 'tigers']
-        if tiger_games:
-            captures = [r['captures_made'] for r in tiger_games]
-            ax4.hist(captures, bins=range(1, max(captures) + 2), alpha=0.7, color='red', edgecolor='black')
-            ax4.set_xlabel('Captures Made')
-            ax4.set_ylabel('Frequency')
-            ax4.set_title('Captures in Tiger Wins')
-            ax4.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig('advanced_training_analysis.png', dpi=300, bbox_inches='tight')
-        print("📊 Training analysis saved as 'advanced_training_analysis.png'")
-        plt.close()
+        """Create training analysis visualizations (plotting lives in analyze.py)."""
+        try:
+            from .analyze import create_training_visualizations
+        except ImportError as e:
+            print(f"⚠️ Skipping training visualizations: {e}")
+            return
+        create_training_visualizations(results, strategy_stats)
 
     def _run_analysis(self, results: List[Dict], filename: str):
-        """Generates and saves a plot of the training results."""
-        episodes = [r['episode'] for r in results]
-        moves = [r['moves_played'] for r in results]
-        
-        tiger_wins = [1 if str(r.get('winner')) == 'Player.TIGER' else 0 for r in results]
-        goat_wins = [1 if str(r.get('winner')) == 'Player.GOAT' else 0 for r in results]
-
-        # Calculate moving averages
-        window = 100
-        tiger_win_rate = pd.Series(tiger_wins).rolling(window=window).mean()
-        goat_win_rate = pd.Series(goat_wins).rolling(window=window).mean()
-        avg_moves = pd.Series(moves).rolling(window=window).mean()
-
-        fig, ax1 = plt.subplots(figsize=(12, 7))
-
-        ax1.set_xlabel('Episode')
-        ax1.set_ylabel('Win Rate (Moving Average)')
-        ax1.plot(episodes, tiger_win_rate, 'r-', label='Tiger Win Rate')
-        ax1.plot(episodes, goat_win_rate, 'g-', label='Goat Win Rate')
-        ax1.tick_params(axis='y')
-        ax1.legend(loc='upper left')
-        ax1.set_ylim(0, 1)
-
-        ax2 = ax1.twinx()
-        ax2.set_ylabel('Average Game Length (Moving Average)', color='b')
-        ax2.plot(episodes, avg_moves, 'b-', label='Avg Game Length')
-        ax2.tick_params(axis='y', labelcolor='b')
-        ax2.legend(loc='upper right')
-
-        fig.tight_layout()
-        plt.title('Advanced AI Training Analysis')
-        plt.savefig(filename)
-        plt.close()
-        print(f"\n📊 Training analysis saved as '{filename}'")
+        """Generates and saves a plot of the training results (plotting lives in analyze.py)."""
+        try:
+            from .analyze import plot_training_curves
+        except ImportError as e:
+            print(f"⚠️ Skipping training analysis plot: {e}")
+            return
+        plot_training_curves(results, filename)
 
 def main():
     """Main function to run the training system."""
+    logging.basicConfig(level=logging.WARNING)
     trainer = AdvancedTrainingSystem()
     # Train for a specified number of episodes
     final_stats = trainer.train_agents(episodes=2000, save_interval=500)
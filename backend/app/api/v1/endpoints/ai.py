@@ -20,7 +20,7 @@ def convert_board_to_numpy(board: list[list[str]]) -> np.ndarray:
         'EMPTY': PieceType.EMPTY.value
     }
     
-    new_board = np.zeros((5,5), dtype=int)
+    new_board = np.zeros((5,5), dtype=np.int8)
     for r in range(5):
         for c in range(5):
             # The frontend board might be using 'T', 'G', or 'EMPTY'
@@ -4,7 +4,9 @@ Sophisticated strategic agents for Tigers and Goats with proper capture mechanic
 """
 
 import numpy as np
-import random
+import functools
+import logging
+from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 import sys
@@ -12,8 +14,10 @@ from pathlib import Path
 
 # Import from the same core directory
 try:
-    from .baghchal_env import BaghchalEnv, Player, GamePhase, PieceType
-    print("✅ Successfully imported Player from baghchal_env")
+    from .baghchal_env import BaghchalEnv, Player, GamePhase, PieceType, SQUARE_BITS, FULL_BOARD_BB
+    from ..ai.agents import SearchingAgent
+    from ..ai._ai_kernels import (bitboard_tiger_mobility, bitboard_capturable_squares, board_bitboards, NEAR_MASKS,
+                                  STEP_TABLE, STEP_LAND, STEP_COUNT)
 except ImportError as e:
     print(f"Warning: Could not import BaghchalEnv from backend: {e}")
     # Fallback enum definitions if import fails
@@ -21,6 +25,77 @@ except ImportError as e:
         TIGER = 1
         GOAT = 2
 
+logger = logging.getLogger(__name__)
+
+# PieceType values as plain ints for the board checks below
+_EMPTY = 0
+_TIGER = 1
+_GOAT = 2
+
+# Corner squares as flat indices (row * 5 + col)
+_CORNERS_FLAT = frozenset({0, 4, 20, 24})
+# Line directions for wall formations: right, down, diagonal-down-right, diagonal-down-left
+_LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+def _actions_to_array(valid_actions: List[Tuple]) -> np.ndarray:
+    """int8 (N, 5) matrix of actions: column 0 is 1 for moves and 0 for placements, columns 1-4 are
+    (from_r, from_c, to_r, to_c), with placements repeating their target as the source."""
+    arr = np.empty((len(valid_actions), 5), dtype=np.int8)
+    for i, action in enumerate(valid_actions):
+        if action[0] == 'move':
+            arr[i] = (1, action[1], action[2], action[3], action[4])
+        else:
+            arr[i] = (0, action[1], action[2], action[1], action[2])
+    return arr
+
+def _flat(board: np.ndarray) -> np.ndarray:
+    """Flat length-25 int8 view of the board for the mobility kernels."""
+    return np.ascontiguousarray(board, dtype=np.int8).ravel()
+
+def _bitboards(board: np.ndarray) -> Tuple[int, int, int]:
+    """Tiger, goat and empty occupancy of the board as 25-bit masks (bit index = row * 5 + col)."""
+    flat = _flat(board)
+    tiger_bb = int(SQUARE_BITS[flat == _TIGER].sum())
+    goat_bb = int(SQUARE_BITS[flat == _GOAT].sum())
+    return tiger_bb, goat_bb, FULL_BOARD_BB ^ (tiger_bb | goat_bb)
+
+def _danger_mask(board: np.ndarray, tiger_positions: List[Tuple]) -> np.ndarray:
+    """bool[5,5] mask of squares where a goat could be jumped right away by one of the tigers."""
+    _, _, empty_bb = board_bitboards(_flat(board))
+    tiger_bb = sum(1 << (tr * 5 + tc) for tr, tc in tiger_positions)
+    # One pass over the 8 directions: a tiger on one side of the square, an empty landing on the other
+    danger_bb = int(bitboard_capturable_squares(tiger_bb, empty_bb))
+    return ((SQUARE_BITS & danger_bb) != 0).reshape(5, 5)
+
+def _as_tuples(positions: np.ndarray) -> List[Tuple[int, int]]:
+    """(r, c) tuples from an argwhere array, for the list-based helpers."""
+    return [tuple(p) for p in positions.tolist()]
+
+@dataclass
+class BoardView:
+    """A position scanned once per decision: piece lists, flat board, bitboards and capture danger."""
+    board: np.ndarray
+    flat: np.ndarray
+    tigers: np.ndarray
+    goats: np.ndarray
+    tiger_positions: List[Tuple[int, int]]
+    goat_positions: List[Tuple[int, int]]
+    danger: np.ndarray
+    tiger_bb: int
+    goat_bb: int
+    empty_bb: int
+    
+    @classmethod
+    def build(cls, board: np.ndarray) -> "BoardView":
+        """Locate every tiger and goat in one vectorized pass per piece type and derive the rest."""
+        board = np.asarray(board)
+        flat = _flat(board)
+        tigers = np.argwhere(board == _TIGER)
+        goats = np.argwhere(board == _GOAT)
+        tiger_positions = _as_tuples(tigers)
+        return cls(board, flat, tigers, goats, tiger_positions, _as_tuples(goats),
+                   _danger_mask(flat, tiger_positions), *_bitboards(flat))
+
 class TigerStrategy(Enum):
     AGGRESSIVE_HUNT = "aggressive_hunt"
     OPPORTUNISTIC = "opportunistic"
@@ -35,296 +110,323 @@ class GoatStrategy(Enum):
     ADVANCED_TRAPPING = "advanced_trapping"
     WALL_BUILDER = "wall_builder"
 
-class AdvancedTigerAI:
+class AdvancedTigerAI(SearchingAgent):
     """Advanced Tiger AI with sophisticated hunting strategies."""
     
-    def __init__(self, strategy: TigerStrategy = TigerStrategy.AGGRESSIVE_HUNT, difficulty: str = "expert"):
+    player = Player.TIGER
+    strategy_type = TigerStrategy
+    
+    def __init__(self, strategy: TigerStrategy = TigerStrategy.AGGRESSIVE_HUNT, difficulty: str = "expert",
+                 search_depth: Optional[int] = None, time_budget: Optional[float] = None):
+        super().__init__(difficulty, search_depth, time_budget=time_budget)
         self.strategy = strategy
-        self.difficulty = difficulty
-        print(f"🐅 Advanced Tiger AI initialized: {strategy.value} ({difficulty})")
+        logger.debug("🐅 Advanced Tiger AI initialized: %s (%s)", strategy.value, difficulty)
     
     def select_action(self, env, state: Dict) -> Optional[Tuple]:
         """Select the best action using advanced strategic analysis."""
         valid_actions = env.get_valid_actions(Player.TIGER)
         if not valid_actions:
-            print("❌ TIGER AI: No valid actions available from environment.")
+            logger.debug("❌ TIGER AI: No valid actions available from environment.")
             return None
         
-        print(f"🔍 TIGER AI: Found {len(valid_actions)} valid actions.")
+        logger.debug("🔍 TIGER AI: Found %d valid actions.", len(valid_actions))
+        
+        # Look ahead with alpha-beta; the greedy heuristics below order the moves and score the leaves
+        if self.search_depth > 0:
+            action = self._search_best_action(env, valid_actions)
+            logger.debug("🧠 TIGER AI: Searched %d nodes to depth %d: %s", self.nodes_searched, self.depth_reached, action)
+            return action
+        
+        # Position scanned once per turn; its flat goat mask is shared by the capture check
+        view = BoardView.build(state['board'])
         
         # PRIORITY 1: Always prioritize captures
-        capture_actions = self._find_capture_actions(valid_actions, state['board'])
+        capture_actions = self._find_capture_actions(valid_actions, view.board, view.flat == _GOAT)
         if capture_actions:
-            print(f"🎯 TIGER AI: Found {len(capture_actions)} capture opportunities!")
+            logger.debug("🎯 TIGER AI: Found %d capture opportunities!", len(capture_actions))
             return self._select_best_capture(capture_actions, state)
         
         # PRIORITY 2: Strategic positioning
-        print("✅ TIGER AI: No captures, selecting strategic move.")
-        return self._select_strategic_action(valid_actions, state)
+        logger.debug("✅ TIGER AI: No captures, selecting strategic move.")
+        return self._select_strategic_action(valid_actions, state, view)
     
-    def _find_capture_actions(self, valid_actions: List[Tuple], board: np.ndarray) -> List[Tuple]:
+    def _find_capture_actions(self, valid_actions: List[Tuple], board: np.ndarray,
+                              is_goat: Optional[np.ndarray] = None) -> List[Tuple]:
         """Find all actions that result in capturing goats."""
-        capture_actions = []
+        if not valid_actions:
+            return []
+        if is_goat is None:
+            is_goat = _flat(board) == _GOAT
         
-        for action in valid_actions:
-            if len(action) == 5 and action[0] == 'move':
-                from_r, from_c, to_r, to_c = action[1], action[2], action[3], action[4]
-                
-                # Check if this is a capture move (distance > 1 indicates a jump)
-                distance = max(abs(to_r - from_r), abs(to_c - from_c))
-                if distance > 1:
-                    # Verify there's a goat to capture
-                    mid_r = (from_r + to_r) // 2
-                    mid_c = (from_c + to_c) // 2
-                    if 0 <= mid_r < 5 and 0 <= mid_c < 5 and board[mid_r, mid_c] == 2:  # Goat value
-                        capture_actions.append(action)
-        
-        return capture_actions
+        arr = _actions_to_array(valid_actions)
+        move_idx = np.flatnonzero(arr[:, 0] == 1)
+        moves = arr[move_idx].astype(np.intp)
+        
+        # A capture jumps (distance > 1) over a goat sitting on the midpoint; a straight two-step
+        # jump's midpoint is the mean of its flat square indices, so no bounds check is needed
+        distance = np.maximum(np.abs(moves[:, 3] - moves[:, 1]), np.abs(moves[:, 4] - moves[:, 2]))
+        mid_sq = (moves[:, 1] * 5 + moves[:, 2] + moves[:, 3] * 5 + moves[:, 4]) // 2
+        mask = (distance > 1) & is_goat[mid_sq]
+        
+        return [valid_actions[i] for i in move_idx[mask]]
     
     def _select_best_capture(self, capture_actions: List[Tuple], state: Dict) -> Tuple:
         """Select the best capture action."""
         # For now, just return the first capture (all captures are valuable)
         selected_capture = capture_actions[0]
-        print(f"✅ TIGER AI: Selected best capture: {selected_capture}")
+        logger.debug("✅ TIGER AI: Selected best capture: %s", selected_capture)
         return selected_capture
     
-    def _select_strategic_action(self, valid_actions: List[Tuple], state: Dict) -> Optional[Tuple]:
+    def _select_strategic_action(self, valid_actions: List[Tuple], state: Dict,
+                                 view: Optional[BoardView] = None) -> Optional[Tuple]:
         """Select action based on current strategy."""
-        board = state['board']
-        
-        # Find goat positions
-        goat_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 2:  # Goat value
-                    goat_positions.append((r, c))
+        if view is None:
+            view = BoardView.build(state['board'])
+        goat_positions = view.goat_positions
         
         best_action = None
         best_score = -1
         
         for action in valid_actions:
             if len(action) >= 5 and action[0] == 'move':
-                from_r, from_c, to_r, to_c = action[1], action[2], action[3], action[4]
-                
-                # Score based on proximity to goats
-                score = 0
-                for goat_r, goat_c in goat_positions:
-                    old_distance = abs(from_r - goat_r) + abs(from_c - goat_c)
-                    new_distance = abs(to_r - goat_r) + abs(to_c - goat_c)
-                    if new_distance < old_distance:
-                        score += 10  # Getting closer to goat
-                    
-                    # Bonus for adjacent positioning (setup for capture)
-                    if new_distance == 1:
-                        score += 20
-                
-                # Bonus for center control
-                if (to_r, to_c) == (2, 2):
-                    score += 15
+                score = self._score_strategic_move(action, goat_positions)
                 
                 if score > best_score:
                     best_score = score
                     best_action = action
         
         if best_action:
-            print(f"✅ TIGER AI: Selected best strategic action with score {best_score}: {best_action}")
+            logger.debug("✅ TIGER AI: Selected best strategic action with score %s: %s", best_score, best_action)
             return best_action
         else:
             # Fallback to a random valid action if no strategic action is found
-            selected_action = random.choice(valid_actions)
-            print(f"⚠️ TIGER AI: No best action found, defaulting to random action: {selected_action}")
+            selected_action = valid_actions[int(self.rng.integers(len(valid_actions)))]
+            logger.debug("⚠️ TIGER AI: No best action found, defaulting to random action: %s", selected_action)
             return selected_action
+    
+    def _score_strategic_move(self, action: Tuple, goat_positions: List[Tuple]) -> int:
+        """Score a tiger move by how much it closes in on the goats."""
+        from_r, from_c, to_r, to_c = action[1], action[2], action[3], action[4]
+        
+        # Score based on proximity to goats
+        score = 0
+        for goat_r, goat_c in goat_positions:
+            old_distance = abs(from_r - goat_r) + abs(from_c - goat_c)
+            new_distance = abs(to_r - goat_r) + abs(to_c - goat_c)
+            if new_distance < old_distance:
+                score += 10  # Getting closer to goat
+            
+            # Bonus for adjacent positioning (setup for capture)
+            if new_distance == 1:
+                score += 20
+        
+        # Bonus for center control
+        if (to_r, to_c) == (2, 2):
+            score += 15
+        
+        return score
+    
+    def _action_order_scores(self, env, actions: List[Tuple]) -> List[int]:
+        """Order tiger moves in the search by the greedy strategic score."""
+        goat_positions = _as_tuples(env.goat_positions[:env.goat_count])
+        return [self._score_strategic_move(action, goat_positions) for action in actions]
 
-class AdvancedGoatAI:
+class AdvancedGoatAI(SearchingAgent):
     """Advanced Goat AI with sophisticated defensive and trapping strategies."""
     
-    def __init__(self, strategy: GoatStrategy = GoatStrategy.DEFENSIVE_BLOCK, difficulty: str = "expert"):
+    player = Player.GOAT
+    strategy_type = GoatStrategy
+    
+    def __init__(self, strategy: GoatStrategy = GoatStrategy.DEFENSIVE_BLOCK, difficulty: str = "expert",
+                 search_depth: Optional[int] = None, time_budget: Optional[float] = None):
+        super().__init__(difficulty, search_depth, time_budget=time_budget)
+        # A one-ply goat search never sees the tiger's reply, so it would trade the greedy safety filter for
+        # a leaf score that cannot spot a hanging goat; search at least through the reply instead
+        if self.search_depth == 1:
+            self.search_depth = 2
         self.strategy = strategy
-        self.difficulty = difficulty
-        print(f"🐐 Advanced Goat AI initialized: {strategy.value} ({difficulty})")
+        logger.debug("🐐 Advanced Goat AI initialized: %s (%s)", strategy.value, difficulty)
     
     def select_action(self, env, state: Dict) -> Optional[Tuple]:
         """Select the best action using advanced defensive and trapping analysis."""
         valid_actions = env.get_valid_actions(Player.GOAT)
         if not valid_actions:
-            print(f"❌ GOAT AI: No valid actions available from environment.")
+            logger.debug("❌ GOAT AI: No valid actions available from environment.")
             return None
         
-        print(f"🔍 GOAT AI: Found {len(valid_actions)} valid actions. Phase: {state.get('phase')}. First 5 actions: {valid_actions[:5]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 GOAT AI: Found %d valid actions. Phase: %s. First 5 actions: %s",
+                         len(valid_actions), state.get('phase'), valid_actions[:5])
+        
+        # Look ahead with alpha-beta; the greedy heuristics below order the moves and score the leaves
+        if self.search_depth > 0:
+            action = self._search_best_action(env, valid_actions)
+            logger.debug("🧠 GOAT AI: Searched %d nodes to depth %d: %s", self.nodes_searched, self.depth_reached, action)
+            return action
+        
+        # Position scanned once and shared by every helper below
+        view = BoardView.build(state['board'])
+        
+        # One pass over the actions: capture safety and a bound on the tiger mobility each can take away
+        evaluated = self._evaluate_actions(valid_actions, state, view)
+        reduction_bounds = {action: bound for action, _, bound in evaluated}
         
         # PRIORITY 1: Avoid immediate capture threats
-        safe_actions = self._filter_safe_actions(valid_actions, state)
+        safe_actions = [action for action, is_safe, _ in evaluated if is_safe]
         if not safe_actions:
-            print("⚠️ GOAT AI: No completely safe moves available, checking escape moves.")
+            logger.debug("⚠️ GOAT AI: No completely safe moves available, checking escape moves.")
             # If no completely safe moves, try to find moves that at least escape current threats
-            escape_actions = self._find_escape_actions(valid_actions, state)
+            escape_actions = self._find_escape_actions(valid_actions, state, view)
             safe_actions = escape_actions if escape_actions else valid_actions
-            print(f"🐐 GOAT AI: Using {len(safe_actions)} escape/risk actions.")
+            logger.debug("🐐 GOAT AI: Using %d escape/risk actions.", len(safe_actions))
         else:
-            print(f"✅ GOAT AI: Found {len(safe_actions)} safe actions out of {len(valid_actions)} valid actions.")
+            logger.debug("✅ GOAT AI: Found %d safe actions out of %d valid actions.", len(safe_actions), len(valid_actions))
         
         # PRIORITY 2: Among safe moves, prioritize tiger trapping
-        trapping_actions = self._find_trapping_actions(safe_actions, state)
-        if trapping_actions:
-            print(f"🎯 GOAT AI: Found {len(trapping_actions)} tiger trapping opportunities!")
-            return self._select_best_trapping_action(trapping_actions, state)
+        trapping_action = self._select_trapping_action(safe_actions, reduction_bounds, state, view)
+        if trapping_action is not None:
+            return trapping_action
         
         # PRIORITY 3: Formation building and strategic positioning
-        return self._select_strategic_action(safe_actions, state)
+        return self._select_strategic_action(safe_actions, state, view)
     
-    def _filter_safe_actions(self, valid_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Filter out actions that would result in immediate capture."""
-        safe_actions = []
+    def _evaluate_actions(self, actions: List[Tuple], state: Dict,
+                          view: Optional[BoardView] = None) -> List[Tuple[Tuple, bool, int]]:
+        """(action, is_safe, upper bound on the tiger mobility it removes) for every action, in one pass."""
         board = state['board']
-        
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 1:
-                    tiger_positions.append((r, c))
-        
-        for action in valid_actions:
-            if action[0] == 'place':
-                target_pos = (action[1], action[2])
-            elif action[0] == 'move':
-                target_pos = (action[3], action[4])
-            else:
-                continue
-            
-            if self._is_position_safe(target_pos, tiger_positions, board, action):
-                safe_actions.append(action)
-        
-        return safe_actions
-    
-    def _find_escape_actions(self, valid_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Find actions that move goats away from immediate tiger threats."""
-        escape_actions = []
-        board = state['board']
-        
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 1:
-                    tiger_positions.append((r, c))
-        
-        for action in valid_actions:
+        if view is None:
+            view = BoardView.build(board)
+        # Goat moves never move a tiger, so the scanned tiger positions and danger mask hold for every action
+        tiger_positions = view.tiger_positions
+        danger = view.danger
+        weights = self._mobility_weights(board, tiger_positions)
+        
+        # Every threat the safety check looks for (a jump, two adjacent tigers, a sandwich between two
+        # tigers) needs a tiger within two steps of the target, so targets outside this zone are safe
+        threat_bb = 0
+        for tr, tc in tiger_positions:
+            threat_bb |= NEAR_MASKS[tr * 5 + tc]
+        
+        evaluated = []
+        for action in actions:
+            target_pos = (action[1], action[2]) if action[0] == 'place' else (action[3], action[4])
+            is_safe = (not (threat_bb >> (target_pos[0] * 5 + target_pos[1])) & 1 or
+                       self._is_position_safe(target_pos, tiger_positions, board, action, danger))
+            bound = weights[target_pos[0] * 5 + target_pos[1]]
             if action[0] == 'move':
-                from_pos = (action[1], action[2])
-                to_pos = (action[3], action[4])
-                
-                # Check if this move increases distance from nearest tiger
-                current_min_distance = min([abs(from_pos[0] - tp[0]) + abs(from_pos[1] - tp[1]) 
-                                          for tp in tiger_positions] or [999])
-                new_min_distance = min([abs(to_pos[0] - tp[0]) + abs(to_pos[1] - tp[1]) 
-                                      for tp in tiger_positions] or [999])
-                
-                if new_min_distance > current_min_distance:
-                    escape_actions.append(action)
-            elif action[0] == 'place':
-                # For placement, just check if it's not adjacent to tigers
-                target_pos = (action[1], action[2])
-                min_distance = min([abs(target_pos[0] - tp[0]) + abs(target_pos[1] - tp[1]) 
-                                  for tp in tiger_positions] or [999])
-                if min_distance > 1:
-                    escape_actions.append(action)
+                bound += weights[action[1] * 5 + action[2]]
+            evaluated.append((action, is_safe, int(bound)))
         
-        return escape_actions
+        return evaluated
     
-    def _find_trapping_actions(self, safe_actions: List[Tuple], state: Dict) -> List[Tuple]:
-        """Find actions that help trap tigers by reducing their mobility."""
-        trapping_actions = []
-        board = state['board']
-        
-        for action in safe_actions:
-            # Simulate the action on a temporary board
-            temp_board = np.copy(board)
-            
-            if action[0] == 'place':
-                temp_board[action[1], action[2]] = 2  # Place goat
-            elif action[0] == 'move':
-                temp_board[action[1], action[2]] = 0  # Remove from old position
-                temp_board[action[3], action[4]] = 2  # Place at new position
-            
-            # Calculate tiger mobility before and after
-            current_mobility = self._calculate_tiger_mobility(board)
-            new_mobility = self._calculate_tiger_mobility(temp_board)
-            
-            # If this action reduces tiger mobility, it's a trapping action
-            if new_mobility < current_mobility:
-                trapping_actions.append(action)
+    def _mobility_weights(self, board: np.ndarray, tiger_positions: List[Tuple]) -> np.ndarray:
+        """
+        Per square, the tiger mobility counted through it (as a step or jump target or landing). A goat
+        action can only take away mobility counted through the squares it changes, so this bounds it.
+        """
+        board_flat = _flat(board)
+        weights = np.zeros(25, dtype=np.int32)
+        
+        for tr, tc in tiger_positions:
+            tiger_sq = tr * 5 + tc
+            for k in range(STEP_COUNT[tiger_sq]):
+                step_sq, land_sq = STEP_TABLE[tiger_sq, k], STEP_LAND[tiger_sq, k]
+                if board_flat[step_sq] == _EMPTY:
+                    moves = 1
+                elif board_flat[step_sq] == _GOAT and land_sq >= 0 and board_flat[land_sq] == _EMPTY:
+                    moves = 2
+                else:
+                    continue
+                weights[step_sq] += moves
+                if land_sq >= 0:
+                    weights[land_sq] += moves
         
-        return trapping_actions
+        return weights
     
-    def _select_best_trapping_action(self, trapping_actions: List[Tuple], state: Dict) -> Optional[Tuple]:
-        """Select the trapping action that most reduces tiger mobility."""
-        board = state['board']
-        best_action = None
-        best_mobility_reduction = 0
+    def _select_trapping_action(self, candidates: List[Tuple], reduction_bounds: Dict[Tuple, int], state: Dict,
+                                view: Optional[BoardView] = None) -> Optional[Tuple]:
+        """
+        The candidate that most reduces tiger mobility (the first one on ties), or None if none does.
+        Candidates are tried in order of their reduction bound and the search stops once no remaining
+        candidate could beat the best reduction found.
+        """
+        if view is None:
+            view = BoardView.build(state['board'])
+        
+        order = sorted(range(len(candidates)), key=lambda i: -reduction_bounds[candidates[i]])
+        best_index, best_reduction = None, 0
+        for i in order:
+            bound = reduction_bounds[candidates[i]]
+            if bound == 0 or bound < best_reduction:
+                break
+            reduction = -self._mobility_delta(view, candidates[i])
+            if reduction > best_reduction or (reduction == best_reduction > 0 and i < best_index):
+                best_index, best_reduction = i, reduction
+        
+        if best_index is None:
+            return None
+        best_action = candidates[best_index]
+        logger.debug("🎯 GOAT AI: Selected trapping action reducing tiger mobility by %d: %s",
+                     best_reduction, best_action)
+        return best_action
+    
+    def _find_escape_actions(self, valid_actions: List[Tuple], state: Dict,
+                             view: Optional[BoardView] = None) -> List[Tuple]:
+        """Find actions that move goats away from immediate tiger threats."""
+        if view is None:
+            view = BoardView.build(state['board'])
+        tigers = view.tigers.astype(np.int8)
+        if not valid_actions:
+            return []
         
-        current_mobility = self._calculate_tiger_mobility(board)
+        arr = _actions_to_array(valid_actions)
+        is_move = arr[:, 0] == 1
         
-        for action in trapping_actions:
-            # Simulate the action
-            temp_board = np.copy(board)
-            
-            if action[0] == 'place':
-                temp_board[action[1], action[2]] = 2
-            elif action[0] == 'move':
-                temp_board[action[1], action[2]] = 0
-                temp_board[action[3], action[4]] = 2
-            
-            new_mobility = self._calculate_tiger_mobility(temp_board)
-            mobility_reduction = current_mobility - new_mobility
-            
-            if mobility_reduction > best_mobility_reduction:
-                best_mobility_reduction = mobility_reduction
-                best_action = action
-        
-        if best_action:
-            print(f"🎯 GOAT AI: Selected trapping action reducing tiger mobility by {best_mobility_reduction}: {best_action}")
-            return best_action
+        # Manhattan distance from every source/target square to the nearest tiger
+        if len(tigers):
+            from_dist = np.abs(arr[:, None, 1:3] - tigers[None, :, :]).sum(-1).min(1)
+            to_dist = np.abs(arr[:, None, 3:5] - tigers[None, :, :]).sum(-1).min(1)
+        else:
+            from_dist = to_dist = np.full(len(arr), 999)
         
-        return trapping_actions[0] if trapping_actions else None
+        # Moves must increase the distance from the nearest tiger; placements must not be adjacent to one
+        mask = np.where(is_move, to_dist > from_dist, to_dist > 1)
+        return [valid_actions[i] for i in np.flatnonzero(mask)]
+    
+    def _mobility_delta(self, view: BoardView, action: Tuple) -> int:
+        """Change in tiger mobility caused by a goat action, recounting only the tigers near it."""
+        changed_bb = 1 << (action[-2] * 5 + action[-1])
+        near_bb = NEAR_MASKS[action[-2] * 5 + action[-1]]
+        if action[0] == 'move':
+            changed_bb |= 1 << (action[1] * 5 + action[2])
+            near_bb |= NEAR_MASKS[action[1] * 5 + action[2]]
+        
+        # A tiger only sees squares up to two steps away, so farther tigers are unaffected
+        nearby_bb = view.tiger_bb & near_bb
+        if not nearby_bb:
+            return 0
+        
+        # Making the action flips the changed squares between goat and empty: two XORs
+        before = bitboard_tiger_mobility(nearby_bb, view.goat_bb, view.empty_bb)
+        after = bitboard_tiger_mobility(nearby_bb, view.goat_bb ^ changed_bb, view.empty_bb ^ changed_bb)
+        return int(after - before)
     
-    def _calculate_tiger_mobility(self, board: np.ndarray) -> int:
+    def _calculate_tiger_mobility(self, board: np.ndarray, tiger_positions: Optional[List[Tuple]] = None) -> int:
         """Calculate total number of moves available to all tigers."""
-        total_moves = 0
-        
-        # Find all tiger positions
-        tiger_positions = []
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 1:
-                    tiger_positions.append((r, c))
-        
-        # Count valid moves for each tiger
-        for tiger_pos in tiger_positions:
-            tr, tc = tiger_pos
-            
-            # Check all 8 directions for regular moves
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-            
-            for dr, dc in directions:
-                new_r, new_c = tr + dr, tc + dc
-                
-                # Regular move
-                if (0 <= new_r < 5 and 0 <= new_c < 5 and board[new_r, new_c] == 0):
-                    total_moves += 1
-                
-                # Capture move (jump over goat)
-                elif (0 <= new_r < 5 and 0 <= new_c < 5 and board[new_r, new_c] == 2):
-                    jump_r, jump_c = new_r + dr, new_c + dc
-                    if (0 <= jump_r < 5 and 0 <= jump_c < 5 and board[jump_r, jump_c] == 0):
-                        total_moves += 2  # Captures are more valuable, count double
-        
-        return total_moves
+        tiger_bb, goat_bb, empty_bb = _bitboards(board)
+        # Count valid moves for each known tiger only, if the caller has them
+        if tiger_positions is not None:
+            tiger_bb = sum(1 << (tr * 5 + tc) for tr, tc in tiger_positions)
+        return int(bitboard_tiger_mobility(tiger_bb, goat_bb, empty_bb))
     
-    def _is_position_safe(self, pos: Tuple[int, int], tiger_positions: List[Tuple], board: np.ndarray, action: Tuple) -> bool:
+    def _is_position_safe(self, pos: Tuple[int, int], tiger_positions: List[Tuple], board: np.ndarray, action: Tuple,
+                          danger: Optional[np.ndarray] = None) -> bool:
         """Enhanced safety check that considers multiple threat patterns."""
         # Check direct capture threats
-        for tiger_pos in tiger_positions:
-            if self._can_tiger_capture_at_position(tiger_pos, pos, board):
-                return False
+        if danger is None:
+            danger = _danger_mask(board, tiger_positions)
+        if danger[pos]:
+            return False
         
         # Check if moving into a "sandwich" position between two tigers
         if action[0] == 'move':
@@ -373,41 +475,18 @@ class AdvancedGoatAI:
         
         return False
     
-    def _can_tiger_capture_at_position(self, tiger_pos: Tuple[int, int], target_pos: Tuple[int, int], board: np.ndarray) -> bool:
-        """Enhanced capture detection that considers all valid tiger jump patterns."""
-        tr, tc = tiger_pos
-        gr, gc = target_pos
-        
-        # Check all 8 directions for potential jumps
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for dr, dc in directions:
-            # Check if tiger can jump over target position in this direction
-            if (tr + dr == gr and tc + dc == gc):  # Tiger is one step away from target
-                land_r, land_c = gr + dr, gc + dc  # Landing position after jump
-                
-                # Check if landing position is valid and empty
-                if (0 <= land_r < 5 and 0 <= land_c < 5 and board[land_r, land_c] == 0):
-                    return True
-        
-        return False
-    
-    def _select_strategic_action(self, safe_actions: List[Tuple], state: Dict) -> Optional[Tuple]:
+    def _select_strategic_action(self, safe_actions: List[Tuple], state: Dict,
+                                 view: Optional[BoardView] = None) -> Optional[Tuple]:
         """Enhanced strategic selection with formation building and positioning."""
         if not safe_actions:
-            print("❌ GOAT AI: No actions (safe or otherwise) to select from.")
+            logger.debug("❌ GOAT AI: No actions (safe or otherwise) to select from.")
             return None
         
         board = state['board']
-        tiger_positions = []
-        goat_positions = []
-        
-        for r in range(5):
-            for c in range(5):
-                if board[r, c] == 1:
-                    tiger_positions.append((r, c))
-                elif board[r, c] == 2:
-                    goat_positions.append((r, c))
+        if view is None:
+            view = BoardView.build(board)
+        tiger_positions = view.tiger_positions
+        goat_positions = view.goat_positions
         
         best_action = None
         best_score = -999
@@ -427,13 +506,29 @@ class AdvancedGoatAI:
                 best_action = action
         
         if best_action:
-            print(f"✅ GOAT AI: Selected strategic action with score {best_score}: {best_action}")
+            logger.debug("✅ GOAT AI: Selected strategic action with score %s: %s", best_score, best_action)
             return best_action
         else:
             selected_action = safe_actions[0]
-            print(f"⚠️ GOAT AI: No best action found, defaulting to first available action: {selected_action}")
+            logger.debug("⚠️ GOAT AI: No best action found, defaulting to first available action: %s", selected_action)
             return selected_action
     
+    def _action_order_scores(self, env, actions: List[Tuple]) -> List[int]:
+        """Order goat moves in the search by positional value, pushing unsafe targets last."""
+        board = env.board
+        tiger_positions = _as_tuples(env.tiger_positions[:env.tiger_count])
+        goat_positions = _as_tuples(env.goat_positions[:env.goat_count])
+        danger = _danger_mask(board, tiger_positions)
+        
+        scores = []
+        for action in actions:
+            target_pos = (action[1], action[2]) if action[0] == 'place' else (action[3], action[4])
+            score = self._calculate_enhanced_position_value(target_pos, tiger_positions, goat_positions, board, action)
+            if not self._is_position_safe(target_pos, tiger_positions, board, action, danger):
+                score -= 1000
+            scores.append(score)
+        return scores
+    
     def _calculate_enhanced_position_value(self, pos: Tuple[int, int], tiger_positions: List[Tuple], 
                                          goat_positions: List[Tuple], board: np.ndarray, action: Tuple) -> int:
         """Enhanced position evaluation considering formations, blocking, and strategic value."""
@@ -444,8 +539,11 @@ class AdvancedGoatAI:
         
         # 1. Formation building - bonus for being near other goats
         goat_neighbors = 0
+        nearest_goat_distance = 999
         for goat_pos in goat_positions:
             distance = abs(pos[0] - goat_pos[0]) + abs(pos[1] - goat_pos[1])
+            if distance < nearest_goat_distance:
+                nearest_goat_distance = distance
             if distance == 1:
                 goat_neighbors += 1
                 value += 25  # Strong bonus for formation
@@ -453,7 +551,7 @@ class AdvancedGoatAI:
                 value += 10  # Moderate bonus for proximity
         
         # 2. Strategic positions - corners and edges can be good for defense
-        if pos in [(0, 0), (0, 4), (4, 0), (4, 4)]:  # Corners
+        if pos[0] * 5 + pos[1] in _CORNERS_FLAT:  # Corners
             value += 15
         elif pos[0] == 0 or pos[0] == 4 or pos[1] == 0 or pos[1] == 4:  # Edges
             value += 10
@@ -483,8 +581,6 @@ class AdvancedGoatAI:
         
         # 6. Penalty for isolated positions
         if goat_neighbors == 0:
-            nearest_goat_distance = min([abs(pos[0] - gp[0]) + abs(pos[1] - gp[1]) 
-                                       for gp in goat_positions] or [999])
             if nearest_goat_distance > 3:
                 value -= 15  # Penalty for being too isolated
         
@@ -493,22 +589,21 @@ class AdvancedGoatAI:
     def _calculate_wall_formation_bonus(self, pos: Tuple[int, int], goat_positions: List[Tuple]) -> int:
         """Calculate bonus for creating wall-like formations that can trap tigers."""
         bonus = 0
+        goat_set = set(goat_positions)
         
         # Check for horizontal, vertical, and diagonal line formations
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # right, down, diagonal-down-right, diagonal-down-left
-        
-        for dr, dc in directions:
+        for dr, dc in _LINE_DIRECTIONS:
             line_length = 1  # Start with current position
             
             # Check in positive direction
             r, c = pos[0] + dr, pos[1] + dc
-            while 0 <= r < 5 and 0 <= c < 5 and (r, c) in goat_positions:
+            while 0 <= r < 5 and 0 <= c < 5 and (r, c) in goat_set:
                 line_length += 1
                 r, c = r + dr, c + dc
             
             # Check in negative direction
             r, c = pos[0] - dr, pos[1] - dc
-            while 0 <= r < 5 and 0 <= c < 5 and (r, c) in goat_positions:
+            while 0 <= r < 5 and 0 <= c < 5 and (r, c) in goat_set:
                 line_length += 1
                 r, c = r - dr, c - dc
             
@@ -518,29 +613,34 @@ class AdvancedGoatAI:
         
         return bonus
 
+# AI personalities per difficulty: (tiger strategy, goat strategy, agent difficulty)
+AGENT_PERSONALITIES = {
+    "easy": (TigerStrategy.OPPORTUNISTIC, GoatStrategy.CENTER_CONTROL, "easy"),
+    "medium": (TigerStrategy.AGGRESSIVE_HUNT, GoatStrategy.DEFENSIVE_BLOCK, "medium"),
+    "hard": (TigerStrategy.CENTER_DOMINANCE, GoatStrategy.FORMATION_BUILD, "hard"),
+    "expert": (TigerStrategy.AGGRESSIVE_HUNT, GoatStrategy.ADVANCED_TRAPPING, "expert"),
+    "enhanced": (TigerStrategy.AGGRESSIVE_HUNT, GoatStrategy.WALL_BUILDER, "expert")
+}
+
+@functools.lru_cache(maxsize=None)
+def _get_agent(player_kind: str, difficulty: str):
+    """Build the agent for a player kind ("tiger"/"goat") and difficulty on first use, then reuse it."""
+    personality = AGENT_PERSONALITIES.get(difficulty)
+    if personality is None:
+        return None
+    tiger_strategy, goat_strategy, agent_difficulty = personality
+    if player_kind == "tiger":
+        return AdvancedTigerAI(tiger_strategy, agent_difficulty)
+    if player_kind == "goat":
+        return AdvancedGoatAI(goat_strategy, agent_difficulty)
+    return None
+
 class AdvancedBaghchalAI:
     """Main AI controller that manages both Tiger and Goat agents."""
     
     def __init__(self):
-        # Initialize different AI personalities
-        self.tiger_agents = {
-            "easy": AdvancedTigerAI(TigerStrategy.OPPORTUNISTIC, "easy"),
-            "medium": AdvancedTigerAI(TigerStrategy.AGGRESSIVE_HUNT, "medium"),
-            "hard": AdvancedTigerAI(TigerStrategy.CENTER_DOMINANCE, "hard"),
-            "expert": AdvancedTigerAI(TigerStrategy.AGGRESSIVE_HUNT, "expert"),
-            "enhanced": AdvancedTigerAI(TigerStrategy.AGGRESSIVE_HUNT, "expert")
-        }
-        
-        self.goat_agents = {
-            "easy": AdvancedGoatAI(GoatStrategy.CENTER_CONTROL, "easy"),
-            "medium": AdvancedGoatAI(GoatStrategy.DEFENSIVE_BLOCK, "medium"),
-            "hard": AdvancedGoatAI(GoatStrategy.FORMATION_BUILD, "hard"),
-            "expert": AdvancedGoatAI(GoatStrategy.ADVANCED_TRAPPING, "expert"),
-            "enhanced": AdvancedGoatAI(GoatStrategy.WALL_BUILDER, "expert")
-        }
-        
-        print("🎯 Advanced Baghchal AI System initialized successfully!")
-        print("🐐 Enhanced Goat AI: Now focuses on capture avoidance and tiger trapping!")
+        # Agents are created lazily by _get_agent, only for the difficulties actually requested
+        logger.debug("🎯 Advanced Baghchal AI System initialized successfully!")
     
     def get_ai_move(self, player, difficulty: str, state: Dict) -> Optional[Tuple]:
         """Get the AI's move based on the provided game state."""
@@ -549,17 +649,17 @@ class AdvancedBaghchalAI:
 
         # Determine which AI to use
         if player == Player.TIGER:
-            ai_agent = self.tiger_agents.get(difficulty_lower)
+            ai_agent = _get_agent("tiger", difficulty_lower)
         elif player == Player.GOAT:
-            ai_agent = self.goat_agents.get(difficulty_lower)
+            ai_agent = _get_agent("goat", difficulty_lower)
         else:
             ai_agent = None
 
         if not ai_agent:
-            print(f"🚨 No AI agent found for player {player} and difficulty {difficulty}")
+            logger.warning("🚨 No AI agent found for player %s and difficulty %s", player, difficulty)
             return None
             
-        print(f"🤖 Using AI: {type(ai_agent).__name__} for player {player}")
+        logger.debug("🤖 Using AI: %s for player %s", type(ai_agent).__name__, player)
         
         # The AI needs a BaghchalEnv to calculate valid moves. We'll create a temporary one.
         temp_env = BaghchalEnv()
@@ -576,8 +676,7 @@ class AdvancedBaghchalAI:
 
 def get_ai_move(player: Player, difficulty: str, state: Dict) -> Optional[Tuple]:
     """Top-level function to get an AI move."""
-    ai_system = AdvancedBaghchalAI()
-    return ai_system.get_ai_move(player, difficulty, state)
+    return AdvancedBaghchalAI().get_ai_move(player, difficulty, state)
 
 if __name__ == "__main__":
     print("🎉 Advanced Baghchal AI System ready!") 
\ No newline at end of file
@@ -1,5 +1,5 @@
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, NamedTuple
 from enum import Enum
 
 class Player(Enum):
@@ -15,6 +15,127 @@ class PieceType(Enum):
     TIGER = 1
     GOAT = 2
 
+# Board graph: which intersections are connected (only some squares have diagonals)
+BOARD_ADJACENCY = {
+    (0, 0): [(0, 1), (1, 0), (1, 1)],
+    (0, 1): [(0, 0), (0, 2), (1, 1)],
+    (0, 2): [(0, 1), (0, 3), (1, 2), (1, 1), (1, 3)],
+    (0, 3): [(0, 2), (0, 4), (1, 3)],
+    (0, 4): [(0, 3), (1, 4), (1, 3)],
+    (1, 0): [(0, 0), (2, 0), (1, 1)],
+    (1, 1): [(1, 0), (0, 1), (1, 2), (2, 1), (2, 2), (0, 0), (0, 2), (2, 0)],
+    (1, 2): [(0, 2), (1, 1), (1, 3), (2, 2)],
+    (1, 3): [(0, 3), (0, 4), (1, 2), (1, 4), (2, 2), (2, 3), (2, 4)],
+    (1, 4): [(0, 4), (1, 3), (2, 4)],
+    (2, 0): [(1, 0), (3, 0), (2, 1), (1, 1), (3, 1)],
+    (2, 1): [(2, 0), (1, 1), (3, 1), (2, 2)],
+    (2, 2): [(1, 1), (1, 2), (1, 3), (2, 1), (2, 3), (3, 1), (3, 2), (3, 3)],
+    (2, 3): [(2, 2), (1, 3), (3, 3), (2, 4)],
+    (2, 4): [(1, 4), (1, 3), (2, 3), (3, 3), (3, 4)],
+    (3, 0): [(2, 0), (4, 0), (3, 1)],
+    (3, 1): [(3, 0), (2, 0), (2, 1), (3, 2), (4, 0), (4, 2), (2, 2), (4, 1)],
+    (3, 2): [(3, 1), (2, 2), (3, 3), (4, 2)],
+    (3, 3): [(3, 2), (2, 3), (2, 4), (3, 4), (4, 2), (4, 3), (4, 4), (2, 2)],
+    (3, 4): [(2, 4), (3, 3), (4, 4)],
+    (4, 0): [(3, 0), (4, 1), (3, 1)],
+    (4, 1): [(4, 0), (4, 2), (3, 1)],
+    (4, 2): [(4, 1), (3, 1), (3, 2), (3, 3), (4, 3)],
+    (4, 3): [(4, 2), (3, 3), (4, 4)],
+    (4, 4): [(3, 4), (4, 3), (3, 3)],
+}
+
+def _build_board_tables():
+    """Precompute per-square bitmasks and jump tables from the symmetric board graph."""
+    connected = set()
+    for pos, neighbors in BOARD_ADJACENCY.items():
+        for other in neighbors:
+            connected.add((pos, other))
+            connected.add((other, pos))
+    
+    adjacent_masks = [0] * 25
+    # Indexed by tiger square: the goat jumped over and the landing square
+    jump_over = np.full((25, 8), -1, dtype=np.int8)
+    jump_land = np.full((25, 8), -1, dtype=np.int8)
+    # Indexed by goat square: the tiger source and the landing square
+    jump_src = np.full((25, 8), -1, dtype=np.int8)
+    jump_dst = np.full((25, 8), -1, dtype=np.int8)
+    over_counts = [0] * 25
+    src_counts = [0] * 25
+    
+    for (src, mid) in sorted(connected):
+        src_sq = src[0] * 5 + src[1]
+        mid_sq = mid[0] * 5 + mid[1]
+        adjacent_masks[src_sq] |= 1 << mid_sq
+        
+        land = (2 * mid[0] - src[0], 2 * mid[1] - src[1])
+        if (mid, land) in connected:
+            land_sq = land[0] * 5 + land[1]
+            jump_over[src_sq, over_counts[src_sq]] = mid_sq
+            jump_land[src_sq, over_counts[src_sq]] = land_sq
+            over_counts[src_sq] += 1
+            jump_src[mid_sq, src_counts[mid_sq]] = src_sq
+            jump_dst[mid_sq, src_counts[mid_sq]] = land_sq
+            src_counts[mid_sq] += 1
+    
+    return adjacent_masks, jump_over, jump_land, jump_src, jump_dst
+
+# Board cells hold PieceType values; int8 keeps the board at 25 bytes and gives Numba a stable type
+BOARD_DTYPE = np.int8
+
+# Bitboards use one bit per square, bit index = row * 5 + col
+FULL_BOARD_BB = (1 << 25) - 1
+SQUARE_BITS = np.array([1 << sq for sq in range(25)], dtype=np.int64)
+ADJACENT_MASKS, JUMP_OVER, JUMP_LAND, JUMP_SRC, JUMP_DST = _build_board_tables()
+
+# Plain-tuple views of the same graph for Python loops over a flattened board (square = row * 5 + col)
+SQUARE_POS = tuple((sq // 5, sq % 5) for sq in range(25))
+NEIGHBORS = tuple(tuple(n for n in range(25) if (ADJACENT_MASKS[sq] >> n) & 1) for sq in range(25))
+# TIGER_JUMPS[tiger_sq] = ((over_sq, land_sq), ...); JUMP_TABLE[goat_sq] = ((tiger_sq, land_sq), ...)
+TIGER_JUMPS = tuple(tuple((int(o), int(l)) for o, l in zip(JUMP_OVER[sq], JUMP_LAND[sq]) if o >= 0)
+                    for sq in range(25))
+JUMP_TABLE = tuple(tuple((int(t), int(l)) for t, l in zip(JUMP_SRC[sq], JUMP_DST[sq]) if t >= 0)
+                   for sq in range(25))
+# The same graph keyed by (row, col), built once and shared by every env instead of per game
+BOARD_CONNECTIONS = frozenset((SQUARE_POS[sq], SQUARE_POS[n]) for sq in range(25) for n in NEIGHBORS[sq])
+ADJACENCY_MATRIX = {SQUARE_POS[sq]: tuple(SQUARE_POS[n] for n in NEIGHBORS[sq]) for sq in range(25)}
+# NEIGHBOR_TABLE[sq] is NEIGHBORS[sq] padded with -1, for vectorized move generation
+NEIGHBOR_TABLE = np.full((25, 8), -1, dtype=np.int8)
+for _sq, _neighbors in enumerate(NEIGHBORS):
+    NEIGHBOR_TABLE[_sq, :len(_neighbors)] = _neighbors
+
+# Action kinds used by ActionArray
+ACTION_PLACE = 0
+ACTION_MOVE = 1
+
+class ActionArray(NamedTuple):
+    """
+    Valid actions as contiguous arrays: kinds is int8[N] (ACTION_PLACE / ACTION_MOVE),
+    coords is int8[N,4] (from_r, from_c, to_r, to_c); placements repeat the target as the source.
+    """
+    kinds: np.ndarray
+    coords: np.ndarray
+    
+    def to_tuple(self, index: int) -> Tuple:
+        """The action at index in the ('place', r, c) / ('move', fr, fc, tr, tc) form step() takes."""
+        from_r, from_c, to_r, to_c = self.coords[index].tolist()
+        if self.kinds[index] == ACTION_PLACE:
+            return ('place', to_r, to_c)
+        return ('move', from_r, from_c, to_r, to_c)
+    
+    def to_tuples(self) -> List[Tuple]:
+        return [self.to_tuple(i) for i in range(len(self.kinds))]
+
+class UndoRecord(NamedTuple):
+    """Everything needed to revert an action applied with BaghchalEnv.push."""
+    action: Tuple
+    captured_pos: Optional[Tuple[int, int]]
+    prev_player: Player
+    prev_phase: GamePhase
+    prev_goats_placed: int
+    prev_goats_captured: int
+    # Goat piece-list slot the captured goat held, so pop can put it back in the same place
+    captured_slot: int = -1
+
 class BaghchalEnv:
     """
     Baghchal (Tigers and Goats) game environment.
@@ -43,64 +164,112 @@ class BaghchalEnv:
     
     def _init_board_connections(self):
         """Initialize the valid connections from a predefined adjacency list."""
-        self.adjacency_list = {
-            (0, 0): [(0, 1), (1, 0), (1, 1)],
-            (0, 1): [(0, 0), (0, 2), (1, 1)],
-            (0, 2): [(0, 1), (0, 3), (1, 2), (1, 1), (1, 3)],
-            (0, 3): [(0, 2), (0, 4), (1, 3)],
-            (0, 4): [(0, 3), (1, 4), (1, 3)],
-            (1, 0): [(0, 0), (2, 0), (1, 1)],
-            (1, 1): [(1, 0), (0, 1), (1, 2), (2, 1), (2, 2), (0, 0), (0, 2), (2, 0)],
-            (1, 2): [(0, 2), (1, 1), (1, 3), (2, 2)],
-            (1, 3): [(0, 3), (0, 4), (1, 2), (1, 4), (2, 2), (2, 3), (2, 4)],
-            (1, 4): [(0, 4), (1, 3), (2, 4)],
-            (2, 0): [(1, 0), (3, 0), (2, 1), (1, 1), (3, 1)],
-            (2, 1): [(2, 0), (1, 1), (3, 1), (2, 2)],
-            (2, 2): [(1, 1), (1, 2), (1, 3), (2, 1), (2, 3), (3, 1), (3, 2), (3, 3)],
-            (2, 3): [(2, 2), (1, 3), (3, 3), (2, 4)],
-            (2, 4): [(1, 4), (1, 3), (2, 3), (3, 3), (3, 4)],
-            (3, 0): [(2, 0), (4, 0), (3, 1)],
-            (3, 1): [(3, 0), (2, 0), (2, 1), (3, 2), (4, 0), (4, 2), (2, 2), (4, 1)],
-            (3, 2): [(3, 1), (2, 2), (3, 3), (4, 2)],
-            (3, 3): [(3, 2), (2, 3), (2, 4), (3, 4), (4, 2), (4, 3), (4, 4), (2, 2)],
-            (3, 4): [(2, 4), (3, 3), (4, 4)],
-            (4, 0): [(3, 0), (4, 1), (3, 1)],
-            (4, 1): [(4, 0), (4, 2), (3, 1)],
-            (4, 2): [(4, 1), (3, 1), (3, 2), (3, 3), (4, 3)],
-            (4, 3): [(4, 2), (3, 3), (4, 4)],
-            (4, 4): [(3, 4), (4, 3), (3, 3)],
-        }
-        # For compatibility with the rest of the class that expects a set of tuples
-        self.connections = set()
-        for pos, connected_positions in self.adjacency_list.items():
-            for connected_pos in connected_positions:
-                # Add connections in both directions to ensure symmetry
-                self.connections.add((pos, connected_pos))
-                self.connections.add((connected_pos, pos))
+        self.adjacency_list = BOARD_ADJACENCY
+        # For compatibility with the rest of the class that expects a set of tuples (both directions)
+        self.connections = BOARD_CONNECTIONS
 
     def _create_adjacency_matrix(self):
-        # Returns a dict mapping (row, col) to a list of connected (row, col) positions
-        adjacency = {}
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                pos = (row, col)
-                adjacency[pos] = []
-                for other_row in range(self.board_size):
-                    for other_col in range(self.board_size):
-                        other_pos = (other_row, other_col)
-                        if (pos, other_pos) in self.connections:
-                            adjacency[pos].append(other_pos)
-        return adjacency
+        # Returns a dict mapping (row, col) to a tuple of connected (row, col) positions
+        return ADJACENCY_MATRIX
+    
+    @property
+    def board(self) -> np.ndarray:
+        """The 5x5 board as a C-contiguous int8 array."""
+        return self._board
+    
+    @board.setter
+    def board(self, value):
+        # Boards assigned from outside (API, simulations) are coerced to int8 and rebuild the piece lists
+        self._board = np.ascontiguousarray(value, dtype=BOARD_DTYPE)
+        self._sync_piece_positions()
+    
+    def _sync_piece_positions(self):
+        """Rebuild the piece lists (SoA row/col arrays plus counts) and bitboards from the board."""
+        board = self._board
+        self.tiger_positions = np.zeros((self.num_tigers, 2), dtype=np.int8)
+        self.goat_positions = np.zeros((self.num_goats, 2), dtype=np.int8)
+        self.piece_slots = np.full((self.board_size, self.board_size), -1, dtype=np.int8)
+        
+        tigers = np.argwhere(board == PieceType.TIGER.value)[:self.num_tigers]
+        goats = np.argwhere(board == PieceType.GOAT.value)[:self.num_goats]
+        self.tiger_count = len(tigers)
+        self.goat_count = len(goats)
+        self.tiger_positions[:self.tiger_count] = tigers
+        self.goat_positions[:self.goat_count] = goats
+        for slot, (r, c) in enumerate(tigers):
+            self.piece_slots[r, c] = slot
+        for slot, (r, c) in enumerate(goats):
+            self.piece_slots[r, c] = slot
+        
+        flat = board.ravel()
+        self.tiger_bb = int(SQUARE_BITS[flat == PieceType.TIGER.value].sum())
+        self.goat_bb = int(SQUARE_BITS[flat == PieceType.GOAT.value].sum())
+        self.empty_bb = FULL_BOARD_BB ^ (self.tiger_bb | self.goat_bb)
+    
+    def _move_piece_position(self, piece: int, from_pos: Tuple[int, int], to_pos: Tuple[int, int]):
+        """Update the piece list entry of a piece that moved from from_pos to to_pos."""
+        positions = self.tiger_positions if piece == PieceType.TIGER.value else self.goat_positions
+        slot = self.piece_slots[from_pos]
+        positions[slot] = to_pos
+        self.piece_slots[to_pos] = slot
+        self.piece_slots[from_pos] = -1
+        
+        move_bits = (1 << (from_pos[0] * 5 + from_pos[1])) | (1 << (to_pos[0] * 5 + to_pos[1]))
+        if piece == PieceType.TIGER.value:
+            self.tiger_bb ^= move_bits
+        else:
+            self.goat_bb ^= move_bits
+        self.empty_bb ^= move_bits
+    
+    def _add_goat_position(self, pos: Tuple[int, int]):
+        """Append a goat to the goat piece list."""
+        self.goat_positions[self.goat_count] = pos
+        self.piece_slots[pos] = self.goat_count
+        self.goat_count += 1
+        
+        bit = 1 << (pos[0] * 5 + pos[1])
+        self.goat_bb |= bit
+        self.empty_bb &= ~bit
+    
+    def _insert_goat_position(self, pos: Tuple[int, int], slot: int):
+        """Put a goat back into slot, moving that slot's goat to the end: undoes _remove_goat_position exactly."""
+        if slot != self.goat_count:
+            moved_r, moved_c = self.goat_positions[slot]
+            self.goat_positions[self.goat_count] = (moved_r, moved_c)
+            self.piece_slots[moved_r, moved_c] = self.goat_count
+        self.goat_positions[slot] = pos
+        self.piece_slots[pos] = slot
+        self.goat_count += 1
+        
+        bit = 1 << (pos[0] * 5 + pos[1])
+        self.goat_bb |= bit
+        self.empty_bb &= ~bit
+    
+    def _remove_goat_position(self, pos: Tuple[int, int]):
+        """Remove a goat from the goat piece list by swapping in the last entry."""
+        slot = self.piece_slots[pos]
+        last = self.goat_count - 1
+        if slot != last:
+            last_r, last_c = self.goat_positions[last]
+            self.goat_positions[slot] = (last_r, last_c)
+            self.piece_slots[last_r, last_c] = slot
+        self.piece_slots[pos] = -1
+        self.goat_count = last
+        
+        bit = 1 << (pos[0] * 5 + pos[1])
+        self.goat_bb &= ~bit
+        self.empty_bb |= bit
     
     def reset(self):
         """Reset the game to initial state."""
         # Initialize empty board
-        self.board = np.zeros((self.board_size, self.board_size), dtype=int)
+        board = np.zeros((self.board_size, self.board_size), dtype=BOARD_DTYPE)
         
         # Place tigers in corners
         tiger_positions = [(0, 0), (0, 4), (4, 0), (4, 4)]
         for pos in tiger_positions:
-            self.board[pos] = PieceType.TIGER.value
+            board[pos] = PieceType.TIGER.value
+        self.board = board
         
         # Game state
         self.phase = GamePhase.PLACEMENT
@@ -130,71 +299,72 @@ class BaghchalEnv:
             return []
         
         valid_actions = []
+        cells = self.board.ravel().tolist()
         
-        if self.phase == GamePhase.PLACEMENT:
-            if player == Player.GOAT:
-                # During placement phase, goats can only place on empty positions
-                for row in range(self.board_size):
-                    for col in range(self.board_size):
-                        if self.board[row, col] == PieceType.EMPTY.value:
-                            valid_actions.append(('place', row, col))
-            elif player == Player.TIGER:
-                # During placement phase, tigers can move (but not place)
-                for row in range(self.board_size):
-                    for col in range(self.board_size):
-                        if self.board[row, col] == PieceType.TIGER.value:
-                            # Find valid moves for this tiger
-                            moves = self._get_valid_moves_for_piece((row, col), player)
-                            for move in moves:
-                                valid_actions.append(('move', row, col, move[0], move[1]))
-        
-        elif self.phase == GamePhase.MOVEMENT:
-            # During movement phase, get moves for the current player's pieces
-            piece_type = PieceType.TIGER if player == Player.TIGER else PieceType.GOAT
+        if self.phase == GamePhase.PLACEMENT and player == Player.GOAT:
+            # During placement phase, goats can only place on empty positions
+            for sq, (row, col) in enumerate(SQUARE_POS):
+                if cells[sq] == PieceType.EMPTY.value:
+                    valid_actions.append(('place', row, col))
+        else:
+            # Tigers move in both phases (but never place); goats move once all are placed
+            piece_value = PieceType.TIGER.value if player == Player.TIGER else PieceType.GOAT.value
             
-            for row in range(self.board_size):
-                for col in range(self.board_size):
-                    if self.board[row, col] == piece_type.value:
-                        # Find valid moves for this piece
-                        moves = self._get_valid_moves_for_piece((row, col), player)
-                        for move in moves:
-                            valid_actions.append(('move', row, col, move[0], move[1]))
+            for sq, (row, col) in enumerate(SQUARE_POS):
+                if cells[sq] == piece_value:
+                    # Find valid moves for this piece
+                    for move in self._get_valid_moves_for_square(sq, player, cells):
+                        valid_actions.append(('move', row, col, move[0], move[1]))
         
         return valid_actions
     
+    def get_valid_action_array(self, player: Player) -> ActionArray:
+        """Same actions, in the same order, as get_valid_actions, as an ActionArray."""
+        if self.game_over:
+            return ActionArray(np.empty(0, dtype=np.int8), np.empty((0, 4), dtype=np.int8))
+        
+        cells = self.board.ravel()
+        
+        if self.phase == GamePhase.PLACEMENT and player == Player.GOAT:
+            src = dst = np.flatnonzero(cells == PieceType.EMPTY.value)
+            kind = ACTION_PLACE
+        else:
+            piece_value = PieceType.TIGER.value if player == Player.TIGER else PieceType.GOAT.value
+            squares = np.flatnonzero(cells == piece_value)
+            
+            # One row per piece: its step targets, then (for tigers) its jump landings
+            targets = NEIGHBOR_TABLE[squares]
+            valid = (targets >= 0) & (cells[targets] == PieceType.EMPTY.value)
+            if player == Player.TIGER:
+                over = JUMP_OVER[squares]
+                land = JUMP_LAND[squares]
+                jumps = (over >= 0) & (cells[over] == PieceType.GOAT.value) & (cells[land] == PieceType.EMPTY.value)
+                targets = np.concatenate([targets, land], axis=1)
+                valid = np.concatenate([valid, jumps], axis=1)
+            
+            rows, slots = np.nonzero(valid)
+            src = squares[rows]
+            dst = targets[rows, slots]
+            kind = ACTION_MOVE
+        
+        coords = np.stack([src // 5, src % 5, dst // 5, dst % 5], axis=1).astype(np.int8)
+        return ActionArray(np.full(len(coords), kind, dtype=np.int8), coords)
+    
     def _get_valid_moves_for_piece(self, position: Tuple[int, int], player: Player) -> List[Tuple[int, int]]:
         """Get valid moves for a piece at the given position."""
-        valid_moves = []
+        return self._get_valid_moves_for_square(position[0] * 5 + position[1], player,
+                                                self.board.ravel().tolist())
+    
+    def _get_valid_moves_for_square(self, sq: int, player: Player, cells: List[int]) -> List[Tuple[int, int]]:
+        """Get valid moves for the piece on square sq of the flattened board cells."""
+        # Tigers and goats both step to directly connected empty positions
+        valid_moves = [SQUARE_POS[n] for n in NEIGHBORS[sq] if cells[n] == PieceType.EMPTY.value]
         
         if player == Player.TIGER:
-            # Tigers can move to directly connected empty positions or capture goats
-            # Check all directly connected positions first (one step moves)
-            for (pos1, pos2) in self.connections:
-                if pos1 == position:
-                    target_pos = pos2
-                    if self.board[target_pos] == PieceType.EMPTY.value:
-                        valid_moves.append(target_pos)
-            
-            # Check for capture moves (jumping over goats)
-            # For each directly connected position that has a goat,
-            # check if we can jump over it to an empty position
-            for (pos1, pos2) in self.connections:
-                if pos1 == position and self.board[pos2] == PieceType.GOAT.value:
-                    # Found a goat adjacent to tiger, check if we can jump over it
-                    jump_targets = self._get_jump_targets(position, pos2)
-                    for target in jump_targets:
-                        if (0 <= target[0] < self.board_size and 
-                            0 <= target[1] < self.board_size and
-                            self.board[target] == PieceType.EMPTY.value):
-                            valid_moves.append(target)
-        
-        elif player == Player.GOAT:
-            # Goats can only move to directly connected empty positions
-            for (pos1, pos2) in self.connections:
-                if pos1 == position:
-                    target_pos = pos2
-                    if self.board[target_pos] == PieceType.EMPTY.value:
-                        valid_moves.append(target_pos)
+            # Tigers can also jump over an adjacent goat to the empty point beyond it
+            for over_sq, land_sq in TIGER_JUMPS[sq]:
+                if cells[over_sq] == PieceType.GOAT.value and cells[land_sq] == PieceType.EMPTY.value:
+                    valid_moves.append(SQUARE_POS[land_sq])
         
         return valid_moves
     
@@ -240,22 +410,14 @@ class BaghchalEnv:
     
     def _is_valid_capture_move(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
         """Check if a tiger can capture a goat by jumping along valid board connections."""
-        # Find potential goat positions between from_pos and to_pos
-        # The goat must be directly connected to the tiger,
-        # and the target must be directly connected to the goat
-        
-        for (pos1, pos2) in self.connections:
-            if pos1 == from_pos:
-                # Found a position connected to tiger
-                potential_goat_pos = pos2
-                
-                # Check if this position has a goat
-                if self.board[potential_goat_pos] == PieceType.GOAT.value:
-                    # Check if the target is connected to the goat
-                    if (potential_goat_pos, to_pos) in self.connections:
-                        # Check if target is empty
-                        if self.board[to_pos] == PieceType.EMPTY.value:
-                            return True
+        cells = self.board.ravel().tolist()
+        to_sq = to_pos[0] * 5 + to_pos[1]
+        
+        # The goat must be directly connected to the tiger and the target in line beyond it
+        for over_sq, land_sq in TIGER_JUMPS[from_pos[0] * 5 + from_pos[1]]:
+            if (land_sq == to_sq and cells[over_sq] == PieceType.GOAT.value and
+                    cells[land_sq] == PieceType.EMPTY.value):
+                return True
         
         return False
     
@@ -321,6 +483,7 @@ class BaghchalEnv:
         
         # Place the goat
         self.board[row, col] = PieceType.GOAT.value
+        self._add_goat_position((row, col))
         self.goats_placed += 1
         
         # Check if all goats are placed
@@ -356,12 +519,14 @@ class BaghchalEnv:
         # Execute the move
         self.board[from_pos] = PieceType.EMPTY.value
         self.board[to_pos] = piece_type.value
+        self._move_piece_position(piece_type.value, from_pos, to_pos)
         
         # Check for capture (only tigers can capture)
         if self.current_player == Player.TIGER:
             captured_pos = self._get_captured_position(from_pos, to_pos)
             if captured_pos:
                 self.board[captured_pos] = PieceType.EMPTY.value
+                self._remove_goat_position(captured_pos)
                 self.goats_captured += 1
                 reward = 10  # High reward for capturing a goat
             else:
@@ -371,6 +536,61 @@ class BaghchalEnv:
         
         return reward
     
+    def push(self, action: Tuple) -> UndoRecord:
+        """
+        Apply an action in place for search, skipping validation and game-over checks.
+        
+        Unlike step, no state dict is built and nothing is copied; revert with pop.
+        """
+        undo = UndoRecord(action, None, self.current_player, self.phase,
+                          self.goats_placed, self.goats_captured)
+        
+        if action[0] == 'place':
+            self.board[action[1], action[2]] = PieceType.GOAT.value
+            self._add_goat_position((action[1], action[2]))
+            self.goats_placed += 1
+            if self.goats_placed >= self.num_goats:
+                self.phase = GamePhase.MOVEMENT
+        else:
+            _, from_row, from_col, to_row, to_col = action
+            piece = int(self.board[from_row, from_col])
+            self.board[from_row, from_col] = PieceType.EMPTY.value
+            self.board[to_row, to_col] = piece
+            self._move_piece_position(piece, (from_row, from_col), (to_row, to_col))
+            
+            if piece == PieceType.TIGER.value:
+                captured_pos = self._get_captured_position((from_row, from_col), (to_row, to_col))
+                if captured_pos:
+                    undo = undo._replace(captured_pos=captured_pos, captured_slot=int(self.piece_slots[captured_pos]))
+                    self.board[captured_pos] = PieceType.EMPTY.value
+                    self._remove_goat_position(captured_pos)
+                    self.goats_captured += 1
+        
+        self._switch_player()
+        return undo
+    
+    def pop(self, undo: UndoRecord):
+        """Revert an action previously applied with push."""
+        action = undo.action
+        
+        if action[0] == 'place':
+            self.board[action[1], action[2]] = PieceType.EMPTY.value
+            self._remove_goat_position((action[1], action[2]))
+        else:
+            _, from_row, from_col, to_row, to_col = action
+            piece = int(self.board[to_row, to_col])
+            self.board[from_row, from_col] = piece
+            self.board[to_row, to_col] = PieceType.EMPTY.value
+            self._move_piece_position(piece, (to_row, to_col), (from_row, from_col))
+            if undo.captured_pos is not None:
+                self.board[undo.captured_pos] = PieceType.GOAT.value
+                self._insert_goat_position(undo.captured_pos, undo.captured_slot)
+        
+        self.current_player = undo.prev_player
+        self.phase = undo.prev_phase
+        self.goats_placed = undo.prev_goats_placed
+        self.goats_captured = undo.prev_goats_captured
+    
     def _is_valid_move(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int], player: Player) -> bool:
         """Check if a move is valid for the given player."""
         if player == Player.TIGER:
@@ -42,8 +42,8 @@ class AIManager:
     def _load_q_learning_agents(self):
         """Load trained Q-learning agents if available."""
         models_dir = Path("models/q_learning")
-        tiger_model_path = models_dir / "enhanced_tiger_dual.pkl"
-        goat_model_path = models_dir / "enhanced_goat_dual.pkl"
+        tiger_model_path = models_dir / "enhanced_tiger_dual.npz"
+        goat_model_path = models_dir / "enhanced_goat_dual.npz"
         
         # Load Tiger Q-learning agent
         if tiger_model_path.exists():
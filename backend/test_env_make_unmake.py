@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Engine invariant tests: push/pop make-unmake, the array move generator,
+Q-table action keys and the npz model format
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.core.baghchal_env import BaghchalEnv, Player
+from app.ai.double_q_learning import (DoubleQLearningAgent, encode_action, decode_action,
+                                      NO_MOVE_KEY, N_ACTION_KEYS)
+
+def _snapshot(env):
+    """Every piece of env state push and pop touch, in comparable form."""
+    return (
+        env.board.tolist(),
+        env.tiger_count, env.tiger_positions[:env.tiger_count].tolist(),
+        env.goat_count, env.goat_positions[:env.goat_count].tolist(),
+        env.piece_slots.tolist(),
+        env.tiger_bb, env.goat_bb, env.empty_bb,
+        env.current_player, env.phase, env.goats_placed, env.goats_captured,
+    )
+
+def _random_positions(games, seed=0):
+    """Yield every position reached in a few random games."""
+    rng = random.Random(seed)
+    env = BaghchalEnv()
+    for _ in range(games):
+        env.reset()
+        for _ in range(120):
+            actions = env.get_valid_actions(env.current_player)
+            if env.game_over or not actions:
+                break
+            yield env, actions
+            env.step(rng.choice(actions))
+
+def test_pop_restores_every_push():
+    """Pushing then popping any legal action leaves the env exactly as it was, captures included."""
+    captures = 0
+    for env, actions in _random_positions(40):
+        before = _snapshot(env)
+        for action in actions:
+            undo = env.push(action)
+            captures += undo.captured_pos is not None
+            env.pop(undo)
+            assert _snapshot(env) == before, action
+    assert captures > 0
+
+def test_action_array_matches_action_list():
+    """get_valid_action_array yields the same actions, in the same order, as get_valid_actions."""
+    for env, actions in _random_positions(20, seed=1):
+        for player in (Player.TIGER, Player.GOAT):
+            assert env.get_valid_action_array(player).to_tuples() == env.get_valid_actions(player)
+
+def test_action_keys_round_trip():
+    """Every Q-table key decodes to an action that encodes back to the same key."""
+    for key in range(N_ACTION_KEYS):
+        assert encode_action(decode_action(key)) == key
+    assert encode_action(('place', 4, 4)) == 24
+    assert decode_action(NO_MOVE_KEY) == ('no_move',)
+
+def test_save_and_load_model_round_trip(tmp_path):
+    """A model saved to npz loads back with identical Q-tables, config and stats."""
+    random.seed(0)
+    agent = DoubleQLearningAgent(Player.TIGER)
+    for env, actions in _random_positions(3, seed=2):
+        state = env.get_state()
+        agent.update_q_values(state, actions[0], random.uniform(-10, 10), state, False)
+    agent.training_stats['episodes'] = 3
+
+    path = str(tmp_path / "tiger_model.npz")
+    agent.save_model(path)
+    loaded = DoubleQLearningAgent(Player.TIGER)
+    assert loaded.load_model(path)
+
+    n_states = len(agent.state_index)
+    assert n_states > 0
+    assert loaded.state_index == agent.state_index
+    for name in ('q_table_a', 'q_table_b', 'seen_actions'):
+        np.testing.assert_array_equal(getattr(loaded, name)[:n_states], getattr(agent, name)[:n_states])
+    assert loaded.config.epsilon == pytest.approx(agent.config.epsilon)
+    assert loaded.training_stats['episodes'] == 3